@@ -0,0 +1,989 @@
+import json
+import time
+import asyncio
+import logging
+import aiohttp
+import requests
+from typing import Awaitable, Callable, Dict, Optional, List, Tuple
+from urllib.parse import quote
+
+from FabricDeploymentManager import (
+    CONTENT_HASH_MARKER,
+    POWERBI_SCOPE,
+    DefinitionBlobCache,
+    DeploymentScheduler,
+    ItemDefinitionPackager,
+    LongRunningOperationError,
+    LongRunningOperationPoller,
+    RateLimiter,
+    RetryPolicy,
+    RoleAssignmentReconciler,
+    apply_parameters,
+    endpoint_template,
+    operation_status_url,
+    parse_retry_after,
+    plan_role_assignments
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHttpError(requests.exceptions.HTTPError):
+    """
+    Raised by AsyncResponse.raise_for_status; a requests HTTPError so callers handle both transports alike.
+    """
+
+
+class AsyncResponse:
+    """
+    Fully read HTTP response returned by AsyncFabricHttpTransport.
+    Exposes the subset of requests.Response used by the deployment code.
+    """
+
+    def __init__(self, status_code: int, headers, content: bytes, url: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise AsyncHttpError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class AsyncFabricHttpTransport:
+    """
+    asyncio HTTP transport shared by every AsyncFabricDeploymentManager call.
+    One aiohttp session keeps a bounded keep-alive pool per host, and a semaphore caps the
+    number of requests in flight so thousands of coroutines can share a few connections.
+    Retries follow the same RetryPolicy as FabricHttpTransport.
+    """
+
+    def __init__(self,
+                 limit: int = 256,
+                 limit_per_host: int = 64,
+                 max_concurrency: int = 64,
+                 timeout: Optional[float] = 30,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """
+        Initialize the async HTTP transport.
+
+        Args:
+            limit: Maximum number of pooled connections across all hosts
+            limit_per_host: Maximum number of pooled connections per host
+            max_concurrency: Maximum number of requests in flight at once
+            timeout: Default request timeout in seconds when a call doesn't pass one
+            retry_policy: Retry policy applied to every call (default policy if None)
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so the session binds to the running event loop
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Accept-Encoding": "gzip, deflate"}
+            )
+        return self.session
+
+    async def request(self,
+                      method: str,
+                      url: str,
+                      idempotent: Optional[bool] = None,
+                      already_applied: Optional[Callable[[], Awaitable[Optional[Dict]]]] = None,
+                      **kwargs) -> AsyncResponse:
+        """
+        Send an HTTP request through the shared session, retrying per the retry policy.
+
+        Throttled (429) responses are always retried since the server rejected them unprocessed.
+        Transient failures (5xx, connection errors) of non-idempotent requests are only retried
+        once already_applied confirms the previous attempt left nothing behind.
+
+        Args:
+            method: HTTP method (GET, POST, ...)
+            url: Absolute request URL
+            idempotent: Override whether the request is safe to replay (derived from method if None)
+            already_applied: Coroutine function returning the resource if a failed attempt actually took effect
+            **kwargs: Passed through to aiohttp (json, data, headers, timeout, ...)
+
+        Returns:
+            AsyncResponse: The HTTP response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        policy = self.retry_policy
+        endpoint = f"{method.upper()} {endpoint_template(url)}"
+        if idempotent is None:
+            idempotent = policy.is_idempotent(method)
+
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = await self._send(method, url, **kwargs)
+                if response.status_code not in policy.RETRY_STATUSES:
+                    return response
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                decision = policy.decide(attempt, idempotent)
+                if decision == "give_up":
+                    raise
+                if decision == "probe":
+                    safe, existing = await self._check_applied(already_applied)
+                    if existing is not None:
+                        logger.info(f"  {endpoint} lost its response but was applied; not retrying")
+                        return self._recovered_response(url, existing)
+                    if not safe:
+                        raise
+                if not policy.take_budget(endpoint):
+                    raise
+            else:
+                decision = policy.decide(attempt, idempotent, response)
+                if decision == "give_up":
+                    return response
+                if decision == "probe":
+                    safe, existing = await self._check_applied(already_applied)
+                    if existing is not None:
+                        logger.info(f"  {endpoint} failed with {response.status_code} but was applied; not retrying")
+                        return self._recovered_response(url, existing)
+                    if not safe:
+                        return response
+                if not policy.take_budget(endpoint):
+                    logger.warning(f"  Retry budget exhausted for {endpoint}")
+                    return response
+
+            await asyncio.sleep(policy.next_retry(attempt, method, url, response))
+            attempt += 1
+
+    async def _check_applied(self, already_applied: Optional[Callable[[], Awaitable[Optional[Dict]]]]):
+        # Returns (safe_to_replay, existing_resource) for a non-idempotent request
+        if already_applied is None:
+            return False, None
+        try:
+            existing = await already_applied()
+        except (requests.exceptions.RequestException, aiohttp.ClientError, asyncio.TimeoutError):
+            return False, None
+        return existing is None, existing
+
+    def _recovered_response(self, url: str, resource: Dict) -> AsyncResponse:
+        # Present the already-created resource as a normal successful response
+        return AsyncResponse(200, {"Content-Type": "application/json"}, json.dumps(resource).encode("utf-8"), url)
+
+    async def _send(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> AsyncResponse:
+        session = self._get_session()
+        async with self.semaphore:
+            async with session.request(method, url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs) as response:
+                content = await response.read()
+                return AsyncResponse(response.status, response.headers, content, url)
+
+    async def get(self, url: str, **kwargs) -> AsyncResponse:
+        """Send a GET request through the transport."""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> AsyncResponse:
+        """Send a POST request through the transport."""
+        return await self.request("POST", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> AsyncResponse:
+        """Send a PATCH request through the transport."""
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> AsyncResponse:
+        """Send a DELETE request through the transport."""
+        return await self.request("DELETE", url, **kwargs)
+
+    async def close(self):
+        """Close the session and its pooled connections."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+class AsyncFabricDeploymentManager:
+    """
+    asyncio variant of FabricDeploymentManager.
+    Every call is a coroutine on one shared AsyncFabricHttpTransport, and long-running operations
+    are awaited with asyncio.sleep instead of a poller thread, so hundreds of items across many
+    workspaces can be deployed from a single thread.
+    """
+
+    def __init__(self,
+                 tenant_id: str,
+                 client_id: str,
+                 client_secret: str,
+                 capacity_id: str,
+                 max_concurrency: int = 64,
+                 transport: Optional[AsyncFabricHttpTransport] = None,
+                 fabric_api_base: str = "https://api.fabric.microsoft.com/v1",
+                 authority_host: str = "https://login.microsoftonline.com",
+                 lro_initial_interval: float = 1.0,
+                 lro_max_interval: float = 20.0,
+                 lro_timeout: float = 600.0,
+                 role_requests_per_second: float = 5.0):
+        """
+        Initialize the async Fabric Deployment Manager.
+
+        Args:
+            tenant_id: Azure Tenant ID
+            client_id: Service Principal Client ID
+            client_secret: Service Principal Client Secret
+            capacity_id: Fabric Capacity ID for workspace assignment
+            max_concurrency: Maximum requests in flight (ignored when a transport is passed)
+            transport: Existing transport to share between managers (created if None)
+            fabric_api_base: Base URL of the Fabric REST API
+            authority_host: Azure AD authority used to acquire tokens
+            lro_initial_interval: First poll delay for a 202 operation without Retry-After
+            lro_max_interval: Upper bound for the operation poll interval
+            lro_timeout: Seconds after which a long-running operation is abandoned
+            role_requests_per_second: Maximum role assignment changes started per second
+        """
+        self.tenant_id = tenant_id
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.capacity_id = capacity_id
+        self.fabric_api_base = fabric_api_base.rstrip("/")
+        self.authority_host = authority_host.rstrip("/")
+        self.transport = transport or AsyncFabricHttpTransport(max_concurrency=max_concurrency)
+        self.packager = ItemDefinitionPackager(blob_cache=DefinitionBlobCache(max_disk_bytes=0))
+        self.lro_initial_interval = lro_initial_interval
+        self.lro_max_interval = lro_max_interval
+        self.lro_timeout = lro_timeout
+        self.operations: List[Dict] = []
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._token_locks: Dict[str, asyncio.Lock] = {}
+        self._workspaces: Optional[Dict[str, Dict]] = None
+        self.role_rate_limiter = RateLimiter(role_requests_per_second)
+
+    async def __aenter__(self) -> "AsyncFabricDeploymentManager":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Release the packager threads and the pooled HTTP connections of the transport.
+        """
+        self.packager.close()
+        await self.transport.close()
+
+    async def _get_token(self, scope: str = POWERBI_SCOPE, refresh_margin: float = 300) -> str:
+        """
+        Get a cached token for a scope, acquiring it once when many coroutines need it at the same time.
+
+        Args:
+            scope: OAuth scope to request
+            refresh_margin: Seconds before expiry at which the token is replaced
+
+        Returns:
+            str: Access token
+        """
+        cached = self._tokens.get(scope)
+        if cached and cached[1] - refresh_margin > time.time():
+            return cached[0]
+        lock = self._token_locks.setdefault(scope, asyncio.Lock())
+        async with lock:
+            cached = self._tokens.get(scope)
+            if cached and cached[1] - refresh_margin > time.time():
+                return cached[0]
+            self._tokens[scope] = await self._acquire_token(scope)
+            return self._tokens[scope][0]
+
+    async def _acquire_token(self, scope: str) -> Tuple[str, float]:
+        """
+        Acquire a new token for a scope using Service Principal credentials.
+
+        Args:
+            scope: OAuth scope to request
+
+        Returns:
+            Tuple: (access token, expiry as epoch seconds)
+        """
+        logger.info(f"Acquiring new token for {scope}...")
+
+        token_url = f"{self.authority_host}/{self.tenant_id}/oauth2/v2.0/token"
+
+        payload = {
+            "grant_type": "client_credentials",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "scope": scope
+        }
+
+        try:
+            response = await self.transport.post(token_url, data=payload, idempotent=True)
+            response.raise_for_status()
+
+            token_data = response.json()
+            logger.info("✓ Successfully acquired token")
+            return token_data["access_token"], time.time() + token_data.get("expires_in", 3600)
+
+        except (requests.exceptions.RequestException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"✗ Failed to acquire token: {str(e)}")
+            raise
+
+    async def _get_headers(self) -> Dict[str, str]:
+        """
+        Generate API request headers with authentication token.
+
+        Returns:
+            Dict: Headers dictionary for API requests
+        """
+        token = await self._get_token(POWERBI_SCOPE)
+        return {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json"
+        }
+
+    async def _list(self, url: str) -> List[Dict]:
+        """
+        GET a Fabric collection, following continuation tokens.
+
+        Args:
+            url: Collection URL
+
+        Returns:
+            List: Every entry of the collection
+        """
+        values = []
+        base = url
+        while url:
+            response = await self.transport.get(url, headers=await self._get_headers())
+            response.raise_for_status()
+            data = response.json()
+            values.extend(data.get("value", []))
+            if data.get("continuationUri"):
+                url = data["continuationUri"]
+            elif data.get("continuationToken"):
+                url = f"{base}?continuationToken={quote(data['continuationToken'])}"
+            else:
+                url = None
+        return values
+
+    async def _wait_for_operation(self, response: AsyncResponse, description: str = "") -> Optional[Dict]:
+        """
+        Await the long-running operation behind a 202 Accepted response.
+
+        Args:
+            response: The 202 response carrying Location / x-ms-operation-id headers
+            description: Human-readable label used in logs and operation records
+
+        Returns:
+            Dict: The operation result (e.g. the created item), or None if it has no result payload
+
+        Raises:
+            LongRunningOperationError: If the operation fails, is cancelled or times out
+        """
+        operation_id = response.headers.get("x-ms-operation-id")
+        url = operation_status_url(response, self.fabric_api_base)
+        if not url:
+            raise LongRunningOperationError(
+                f"202 Accepted for {description} without Location or x-ms-operation-id header")
+        operation_id = operation_id or url.rstrip("/").split("/")[-1]
+
+        submitted = time.monotonic()
+        interval = self.lro_initial_interval
+        delay = parse_retry_after(response)
+        polls = 0
+        status = "Running"
+        try:
+            while True:
+                await asyncio.sleep(delay if delay is not None else interval)
+                polls += 1
+                poll = await self.transport.get(url, headers=await self._get_headers())
+                poll.raise_for_status()
+                body = poll.json() if poll.content else {}
+                status = body.get("status", "Running")
+
+                if status == "Succeeded":
+                    result = await self.transport.get(f"{url.rstrip('/')}/result", headers=await self._get_headers())
+                    if result.status_code != 200 or not result.content:
+                        return None
+                    return result.json()
+                if status in LongRunningOperationPoller.TERMINAL_FAILURES:
+                    error = body.get("error") or {}
+                    raise LongRunningOperationError(
+                        f"{description} {status.lower()}: {error.get('message', body)}")
+                if time.monotonic() - submitted > self.lro_timeout:
+                    status = "TimedOut"
+                    raise LongRunningOperationError(f"{description} did not finish within {self.lro_timeout:.0f}s")
+
+                delay = parse_retry_after(poll)
+                if delay is None:
+                    interval = min(interval * 1.5, self.lro_max_interval)
+        except Exception:
+            if status not in LongRunningOperationPoller.TERMINAL_FAILURES and status != "TimedOut":
+                status = "Error"
+            raise
+        finally:
+            latency = time.monotonic() - submitted
+            self.operations.append({
+                "operationId": operation_id,
+                "description": description,
+                "status": status,
+                "latency_seconds": round(latency, 3),
+                "polls": polls
+            })
+            logger.info(f"  Operation {operation_id} ({description}) {status} after {latency:.1f}s and {polls} poll(s)")
+
+    async def _get_workspace_by_name(self, workspace_name: str, refresh: bool = False) -> Optional[Dict]:
+        """
+        Retrieve workspace details by name (case-insensitive) from a cached listing.
+
+        Args:
+            workspace_name: Name of the workspace
+            refresh: Re-list the workspaces instead of using the cached listing
+
+        Returns:
+            Dict: Workspace details if found, None otherwise
+        """
+        if self._workspaces is None or refresh:
+            workspaces = await self._list(f"{self.fabric_api_base}/workspaces")
+            self._workspaces = {ws.get("displayName", "").lower(): ws for ws in workspaces}
+        workspace = self._workspaces.get(workspace_name.lower())
+        if workspace:
+            logger.info(f"✓ Found workspace '{workspace_name}' (ID: {workspace['id']})")
+        return workspace
+
+    async def create_workspace(self, workspace_name: str, capacity_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Create a new Fabric workspace if it doesn't already exist.
+
+        Args:
+            workspace_name: Name of the workspace to create
+            capacity_id: Capacity to assign (the manager's capacity if None)
+
+        Returns:
+            Dict: Workspace details including workspace_id, or None if creation fails
+        """
+        logger.info(f"Checking for existing workspace: {workspace_name}")
+
+        try:
+            existing_workspace = await self._get_workspace_by_name(workspace_name)
+            if existing_workspace:
+                logger.info(f"✓ Workspace '{workspace_name}' already exists (ID: {existing_workspace['id']})")
+                return existing_workspace
+
+            logger.info(f"Creating new workspace: {workspace_name}")
+            payload = {
+                "displayName": workspace_name,
+                "capacityId": capacity_id or self.capacity_id,
+                "description": f"Prod workspace created for {workspace_name}"
+            }
+            response = await self.transport.post(
+                f"{self.fabric_api_base}/workspaces",
+                json=payload,
+                headers=await self._get_headers(),
+                already_applied=lambda: self._get_workspace_by_name(workspace_name, refresh=True)
+            )
+            if response.status_code == 409:
+                logger.info(f"✓ Workspace '{workspace_name}' already exists")
+                return (await self._get_workspace_by_name(workspace_name, refresh=True)
+                        or {"displayName": workspace_name, "id": workspace_name})
+            response.raise_for_status()
+
+            workspace_data = response.json()
+            self._workspaces[workspace_name.lower()] = workspace_data
+            logger.info(f"✓ Workspace created successfully (ID: {workspace_data.get('id')})")
+            return workspace_data
+
+        except (requests.exceptions.RequestException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"✗ Failed to create workspace: {str(e)}")
+            return None
+
+    async def get_workspace_items(self, workspace_id: str) -> Optional[List[Dict]]:
+        """
+        Retrieve all items in a workspace.
+
+        Args:
+            workspace_id: ID of the workspace
+
+        Returns:
+            List: List of items in the workspace, or None if listing fails
+        """
+        logger.info(f"Retrieving items from workspace {workspace_id}")
+        try:
+            items = await self._list(f"{self.fabric_api_base}/workspaces/{workspace_id}/items")
+            logger.info(f"✓ Retrieved {len(items)} items from workspace")
+            return items
+        except (requests.exceptions.RequestException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"✗ Failed to retrieve workspace items: {str(e)}")
+            return None
+
+    async def _find_item(self,
+                         workspace_id: str,
+                         item_name: str,
+                         item_type: Optional[str] = None) -> Optional[Dict]:
+        # Probe used to detect a create that was applied although its response was lost
+        for item in await self._list(f"{self.fabric_api_base}/workspaces/{workspace_id}/items"):
+            if item.get("displayName") == item_name and (item_type is None or item.get("type") == item_type):
+                return item
+        return None
+
+    async def copy_item(self,
+                        source_workspace_id: str,
+                        source_item_id: str,
+                        target_workspace_id: str,
+                        item_name: str) -> Optional[Dict]:
+        """
+        Copy a Fabric item from source to target workspace.
+
+        Args:
+            source_workspace_id: ID of source workspace
+            source_item_id: ID of item to copy
+            target_workspace_id: ID of target workspace
+            item_name: Name for the copied item
+
+        Returns:
+            Dict: Details of copied item, or None if copy fails
+        """
+        logger.info(f"Copying item {source_item_id} from {source_workspace_id} to {target_workspace_id}")
+
+        url = f"{self.fabric_api_base}/workspaces/{source_workspace_id}/items/{source_item_id}/copyTo"
+        payload = {
+            "targetWorkspaceId": target_workspace_id,
+            "displayName": item_name
+        }
+
+        try:
+            response = await self.transport.post(
+                url,
+                json=payload,
+                headers=await self._get_headers(),
+                already_applied=lambda: self._find_item(target_workspace_id, item_name)
+            )
+            response.raise_for_status()
+
+            if response.status_code == 202:
+                item_data = await self._wait_for_operation(response, f"copy of '{item_name}'") or {}
+            else:
+                item_data = response.json()
+            logger.info(f"✓ Item copied successfully (New ID: {item_data.get('id')})")
+            return item_data
+
+        except (requests.exceptions.RequestException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"✗ Failed to copy item: {str(e)}")
+            return None
+        except LongRunningOperationError as e:
+            logger.error(f"✗ Failed to copy item: {str(e)}")
+            return None
+
+    async def deploy_item_from_path(self,
+                                    item_path: str,
+                                    item_type: str,
+                                    item_name: str,
+                                    target_workspace_id: str,
+                                    content_hash: Optional[str] = None,
+                                    definition: Optional[Dict] = None,
+                                    existing_item: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Deploy a Fabric item from local file system path and return the created or updated item.
+
+        Args:
+            item_path: Local path to the item folder
+            item_type: Type of item (Dataflow, Lakehouse, Report, SemanticModel, etc.)
+            item_name: Display name of the item
+            target_workspace_id: Target workspace ID
+            content_hash: Content hash recorded in the item description for incremental deploys
+            definition: Pre-built item definition (packaged from item_path if None)
+            existing_item: Item of the same type and name already in the target workspace;
+                           its definition is updated instead of creating a new item
+
+        Returns:
+            Dict: Created or updated item (a created item may lack an ID if the operation returned
+                  no result), or None on failure
+        """
+        logger.info(f"Deploying {item_type} '{item_name}' to workspace {target_workspace_id}")
+        url = f"{self.fabric_api_base}/workspaces/{target_workspace_id}/items"
+
+        try:
+            if definition is None:
+                # Packaging reads and encodes files; keep it off the event loop
+                definition, _ = await asyncio.to_thread(self.packager.package, item_path)
+
+            if existing_item is not None:
+                return await self._update_item_definition(target_workspace_id, existing_item, definition, content_hash)
+
+            payload = {
+                "displayName": item_name,
+                "type": item_type,
+                "description": f"Deployed from GitHub repository - {item_type}"
+            }
+            if content_hash:
+                payload["description"] += f" [content-sha256:{content_hash}]"
+            if definition["parts"]:
+                payload["definition"] = definition
+
+            response = await self.transport.post(
+                url,
+                json=payload,
+                headers=await self._get_headers(),
+                already_applied=lambda: self._find_item(target_workspace_id, item_name, item_type)
+            )
+
+            if response.status_code == 202:
+                logger.info(f"  {item_type} '{item_name}' accepted, waiting for provisioning...")
+                item_data = await self._wait_for_operation(response, f"{item_type} '{item_name}'") or {}
+            elif response.status_code in [201, 200]:
+                item_data = response.json()
+            else:
+                logger.error(f"✗ API returned status code {response.status_code}")
+                if response.text:
+                    logger.error(f"  Response: {response.text}")
+                return None
+            logger.info(f"✓ {item_type} '{item_name}' deployed successfully (ID: {item_data.get('id')})")
+            return item_data
+
+        except (requests.exceptions.RequestException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"✗ Request failed to deploy {item_type} '{item_name}': {str(e)}")
+            return None
+        except LongRunningOperationError as e:
+            logger.error(f"✗ Provisioning of {item_type} '{item_name}' failed: {str(e)}")
+            return None
+        except OSError as e:
+            logger.error(f"✗ Failed to package {item_type} '{item_name}': {str(e)}")
+            return None
+
+    async def _update_item_definition(self,
+                                      workspace_id: str,
+                                      item: Dict,
+                                      definition: Dict,
+                                      content_hash: Optional[str] = None) -> Dict:
+        """
+        Replace the definition of an existing item and record the new content hash in its description.
+
+        Args:
+            workspace_id: ID of the workspace holding the item
+            item: Existing item (from get_workspace_items)
+            definition: New item definition
+            content_hash: Content hash recorded in the item description
+
+        Returns:
+            Dict: The updated item
+
+        Raises:
+            requests.exceptions.RequestException: If a request fails
+            LongRunningOperationError: If the update operation fails
+        """
+        item_type = item.get("type")
+        item_name = item.get("displayName")
+        url = f"{self.fabric_api_base}/workspaces/{workspace_id}/items/{item['id']}"
+
+        if definition["parts"]:
+            logger.info(f"  {item_type} '{item_name}' exists (ID: {item['id']}); updating its definition")
+            # updateDefinition replaces the whole definition, so replaying it is safe
+            response = await self.transport.post(
+                f"{url}/updateDefinition",
+                json={"definition": definition},
+                headers=await self._get_headers(),
+                idempotent=True
+            )
+            if response.status_code == 202:
+                await self._wait_for_operation(response, f"definition update of {item_type} '{item_name}'")
+            else:
+                response.raise_for_status()
+        else:
+            logger.info(f"⊘ {item_type} '{item_name}' exists and has no definition parts to update")
+
+        description = (CONTENT_HASH_MARKER.sub("", item.get("description") or "").rstrip()
+                       or f"Deployed from GitHub repository - {item_type}")
+        if content_hash:
+            description += f" [content-sha256:{content_hash}]"
+        if description != (item.get("description") or ""):
+            response = await self.transport.patch(
+                url,
+                json={"description": description},
+                headers=await self._get_headers(),
+                idempotent=True
+            )
+            response.raise_for_status()
+
+        logger.info(f"✓ {item_type} '{item_name}' updated successfully (ID: {item['id']})")
+        return {**item, "description": description, "updated": True}
+
+    async def index_workspace_items(self, workspace_id: str) -> Optional[Dict[Tuple[str, str], Dict]]:
+        """
+        List a workspace's items once and index them for create-or-update routing.
+
+        Args:
+            workspace_id: ID of the workspace
+
+        Returns:
+            Dict: Items keyed by (type, displayName), or None if listing failed
+        """
+        items = await self.get_workspace_items(workspace_id)
+        if items is None:
+            return None
+        return {(item.get("type"), item.get("displayName")): item for item in items}
+
+    async def get_role_assignments(self, workspace_id: str) -> List[Dict]:
+        """
+        Retrieve all existing role assignments in a workspace.
+
+        Args:
+            workspace_id: ID of the target workspace
+
+        Returns:
+            List: List of existing role assignments
+        """
+        try:
+            assignments = await self._list(f"{self.fabric_api_base}/workspaces/{workspace_id}/roleAssignments")
+            logger.info(f"✓ Retrieved {len(assignments)} existing role assignments")
+            return assignments
+        except (requests.exceptions.RequestException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"✗ Failed to retrieve role assignments: {str(e)}")
+            return []
+
+    async def _apply_role_change(self, workspace_id: str, action: str, change: Dict) -> Optional[str]:
+        url = f"{self.fabric_api_base}/workspaces/{workspace_id}/roleAssignments"
+        delay = self.role_rate_limiter.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        async def find_assignment():
+            for assignment in await self._list(url):
+                if (assignment.get("principal", {}).get("id") == change["principal"]
+                        and assignment.get("role") == change["role"]):
+                    return assignment
+            return None
+
+        try:
+            if action == "add":
+                response = await self.transport.post(
+                    url,
+                    json={"principal": {"id": change["principal"], "type": change["type"]}, "role": change["role"]},
+                    headers=await self._get_headers(),
+                    already_applied=find_assignment
+                )
+            elif action == "update":
+                response = await self.transport.patch(
+                    f"{url}/{change['assignment_id']}",
+                    json={"role": change["role"]},
+                    headers=await self._get_headers(),
+                    idempotent=True
+                )
+            else:
+                response = await self.transport.delete(f"{url}/{change['assignment_id']}", headers=await self._get_headers())
+                if response.status_code == 404:
+                    return None
+            if response.status_code in [200, 201, 204]:
+                return None
+            return f"{response.status_code}: {response.text}"
+        except (requests.exceptions.RequestException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return str(e)
+
+    async def reconcile_role_assignments(self,
+                                         workspace_id: str,
+                                         desired: List[Dict],
+                                         remove_unlisted: bool = False,
+                                         dry_run: bool = False) -> Optional[Dict]:
+        """
+        Bring the workspace role assignments in line with a desired set in one pass.
+        Uses the same diff as RoleAssignmentReconciler (plan_role_assignments); the changes are
+        applied concurrently, started no faster than role_requests_per_second.
+
+        Args:
+            workspace_id: ID of the target workspace
+            desired: Entries with principal (object ID), type (User, Group, ServicePrincipal) and role
+            remove_unlisted: Remove assignments of principals not in desired (keep the deploying principal listed!)
+            dry_run: Only report the changes that would be made
+
+        Returns:
+            Dict: Diff report with added, updated, removed, unchanged and failed entries, or None if listing failed
+        """
+        logger.info(f"Reconciling {len(desired)} role assignment(s) in workspace {workspace_id}")
+        url = f"{self.fabric_api_base}/workspaces/{workspace_id}/roleAssignments"
+        try:
+            changes = plan_role_assignments(await self._list(url), desired, remove_unlisted)
+        except (requests.exceptions.RequestException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"✗ Failed to reconcile role assignments: {str(e)}")
+            return None
+        except ValueError as e:
+            logger.error(f"✗ Invalid role assignment: {str(e)}")
+            return None
+
+        report = {
+            "workspace_id": workspace_id,
+            "added": [],
+            "updated": [],
+            "removed": [],
+            "unchanged": changes["unchanged"],
+            "failed": [],
+            "dry_run": dry_run
+        }
+        work = [(action, change) for action in ("add", "update", "remove") for change in changes[action]]
+        if dry_run:
+            errors = [None] * len(work)
+        else:
+            errors = await asyncio.gather(*(self._apply_role_change(workspace_id, action, change) for action, change in work))
+
+        prefix = "Would " if dry_run else ""
+        for (action, change), error in zip(work, errors):
+            if error:
+                report["failed"].append({**change, "action": action, "error": error})
+                logger.error(f"✗ Failed to {action} {change['role']} role for {change['principal']}: {error}")
+                continue
+            report[RoleAssignmentReconciler.REPORT_KEYS[action]].append(change)
+            if action == "add":
+                logger.info(f"✓ {prefix}Assign {change['role']} role to {change['principal']}")
+            elif action == "update":
+                logger.info(f"✓ {prefix}Change {change['principal']} from {change['previous_role']} to {change['role']}")
+            else:
+                logger.info(f"✓ {prefix}Remove {change['role']} role from {change['principal']}")
+        for change in report["unchanged"]:
+            logger.info(f"⊘ {change['principal']} already has {change['role']} role")
+        return report
+
+    async def assign_role_to_user(self,
+                                  workspace_id: str,
+                                  user_principal: str,
+                                  role: str = "Admin",
+                                  principal_type: str = "ServicePrincipal") -> bool:
+        """
+        Assign a role to a user/service principal in the workspace.
+
+        Args:
+            workspace_id: ID of the target workspace
+            user_principal: User principal object ID or service principal ID
+            role: Role to assign (Admin, Member, Contributor, Viewer)
+            principal_type: Type of principal (User, ServicePrincipal, Group)
+
+        Returns:
+            bool: True if assignment successful or already exists, False otherwise
+        """
+        report = await self.reconcile_role_assignments(
+            workspace_id,
+            [{"principal": user_principal, "type": principal_type, "role": role}]
+        )
+        return report is not None and not report["failed"]
+
+    async def deploy_items(self,
+                           source_workspace_id: str,
+                           target_workspace_id: str,
+                           item_types: Optional[List[str]] = None) -> Dict:
+        """
+        Copy all items (or specific types) from source to target workspace concurrently.
+        Concurrency is bounded by the transport's in-flight request limit.
+
+        Args:
+            source_workspace_id: ID of source Dev workspace
+            target_workspace_id: ID of target Prod workspace
+            item_types: Specific item types to deploy (all items if None)
+
+        Returns:
+            Dict: Deployment summary with success/failure counts
+        """
+        logger.info(f"Starting item deployment from {source_workspace_id} to {target_workspace_id}")
+        retries_before = self.transport.retry_policy.snapshot()["retries"]
+
+        items = await self.get_workspace_items(source_workspace_id)
+        if not items:
+            logger.warning("No items found to deploy")
+            return {"success": 0, "failed": 0, "skipped": 0}
+
+        summary = {"success": 0, "failed": 0, "skipped": 0, "items": []}
+        to_deploy = []
+        for item in items:
+            if item_types and item.get("type") not in item_types:
+                logger.info(f"⊘ Skipping {item.get('type')}: {item.get('displayName')} (not in deployment list)")
+                summary["skipped"] += 1
+                continue
+            to_deploy.append(item)
+
+        async def deploy(item: Dict) -> Dict:
+            logger.info(f"→ Deploying {item.get('type')}: {item.get('displayName')}")
+            result = await self.copy_item(source_workspace_id, item.get("id"), target_workspace_id,
+                                          f"{item.get('displayName')}_Prod")
+            entry = {"name": item.get("displayName"), "type": item.get("type"),
+                     "status": "deployed" if result else "failed"}
+            if result:
+                entry["new_id"] = result.get("id")
+            return entry
+
+        for entry in await asyncio.gather(*(deploy(item) for item in to_deploy)):
+            summary["success" if entry["status"] == "deployed" else "failed"] += 1
+            summary["items"].append(entry)
+
+        summary["retries"] = self.transport.retry_policy.snapshot()["retries"] - retries_before
+        return summary
+
+    async def deploy_repository_items(self,
+                                      items: List[Dict],
+                                      target_workspace_id: str,
+                                      parameters: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        Deploy items discovered in a repository (see FabricDeploymentManager.get_items_from_github)
+        level by level in dependency order; items of one level are deployed concurrently.
+        Items that already exist in the workspace get their definition updated, and items whose
+        parent failed are reported as failed without deploying.
+
+        Args:
+            items: Items with path, type, displayName and fullName (may carry a package callable
+                   returning (definition, stats), as set up by FabricDeploymentManager.deploy_to_workspaces)
+            target_workspace_id: ID of target workspace
+            parameters: Find/replace overrides applied to item definitions for this workspace
+
+        Returns:
+            Dict: success and failed counts plus per-item entries
+        """
+        summary = {"success": 0, "failed": 0, "items": []}
+        existing = await self.index_workspace_items(target_workspace_id) if items else {}
+        if existing is None:
+            logger.warning("Could not list target workspace items; existing items will not be updated")
+            existing = {}
+
+        async def deploy(item: Dict) -> Dict:
+            logger.info(f"→ Deploying {item['type']}: {item['displayName']} from GitHub")
+            entry = {"name": item["displayName"], "fullName": item["fullName"], "type": item["type"],
+                     "status": "failed", "source": "GitHub"}
+            try:
+                # Packaging reads and encodes files; keep it off the event loop
+                if "package" in item:
+                    definition, _ = await asyncio.to_thread(item["package"], item)
+                else:
+                    definition, _ = await asyncio.to_thread(self.packager.package, item["path"])
+                if parameters:
+                    definition = apply_parameters(definition, parameters)
+            except OSError as e:
+                logger.error(f"✗ Failed to package {item['type']} '{item['displayName']}': {str(e)}")
+                return entry
+            existing_item = existing.get((item["type"], item["displayName"]))
+            result = await self.deploy_item_from_path(item["path"], item["type"], item["displayName"],
+                                                      target_workspace_id, item.get("contentHash"), definition,
+                                                      existing_item)
+            if result is not None:
+                entry.update({"status": "deployed", "action": "updated" if result.get("updated") else "created",
+                              "path": item["path"], "id": result.get("id")})
+            return entry
+
+        scheduler = DeploymentScheduler(items)
+        names = {item["fullName"] for item in items}
+        results: Dict[str, Dict] = {}
+        # Parents (Lakehouse, SemanticModel) finish before the level that references them starts
+        for level in scheduler.levels():
+            ready = []
+            for item in level:
+                failure = scheduler.dependency_failure(item, results, names)
+                if failure is not None:
+                    results[item["fullName"]] = failure
+                else:
+                    ready.append(item)
+            for item, entry in zip(ready, await asyncio.gather(*(deploy(item) for item in ready))):
+                results[item["fullName"]] = entry
+
+        for item in items:
+            entry = results[item["fullName"]]
+            summary["success" if entry["status"] == "deployed" else "failed"] += 1
+            summary["items"].append(entry)
+        return summary
@@ -0,0 +1,226 @@
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from typing import Callable, Dict, List
+
+from FabricDeploymentManager import DefinitionBlobCache, FabricDeploymentManager
+from MockFabricServer import MockFabricServer
+
+logger = logging.getLogger(__name__)
+
+BRANCH = "Dev-Branch"
+
+
+def build_synthetic_repo(root: str, item_count: int) -> str:
+    """
+    Create a git repository with item_count Fabric items in its Development folder.
+    Items alternate between a SemanticModel and a Report bound to it, so the
+    dependency scheduler has real levels to work with. Every report carries the
+    same theme and logo under StaticResources, like reports built from one template.
+
+    Args:
+        root: Directory in which the repository is created
+        item_count: Number of item folders to generate
+
+    Returns:
+        str: Path of the repository (usable as repo_url)
+    """
+    repo = os.path.join(root, f"synthetic-{item_count}")
+    dev = os.path.join(repo, "Development")
+    os.makedirs(dev)
+    theme = json.dumps({"name": "CY24SU06", "dataColors": [f"#{i:06X}" for i in range(0, 0xFFFFFF, 0x3333)]})
+    logo = random.Random(0).randbytes(64 * 1024)
+
+    for i in range(item_count):
+        if i % 2 == 0:
+            folder = os.path.join(dev, f"Model {i}.SemanticModel")
+            os.makedirs(os.path.join(folder, "definition", "tables"))
+            with open(os.path.join(folder, "definition.pbism"), "w") as f:
+                json.dump({"version": "4.0", "settings": {}}, f)
+            with open(os.path.join(folder, "definition", "tables", "Sales.tmdl"), "w") as f:
+                f.write(f"table Sales\n\tcolumn Amount\n\t\tdataType: decimal\n\tmeasure Total{i} = SUM(Sales[Amount])\n")
+            item_type = "SemanticModel"
+        else:
+            folder = os.path.join(dev, f"Report {i}.Report")
+            os.makedirs(folder)
+            with open(os.path.join(folder, "definition.pbir"), "w") as f:
+                json.dump({"version": "4.0", "datasetReference": {"byPath": {"path": f"../Model {i - 1}.SemanticModel"}}}, f)
+            with open(os.path.join(folder, "report.json"), "w") as f:
+                json.dump({"sections": [{"name": f"Page {i}", "visualContainers": []}]}, f)
+            resources = os.path.join(folder, "StaticResources")
+            os.makedirs(os.path.join(resources, "SharedResources", "BaseThemes"))
+            os.makedirs(os.path.join(resources, "RegisteredResources"))
+            with open(os.path.join(resources, "SharedResources", "BaseThemes", "CY24SU06.json"), "w") as f:
+                f.write(theme)
+            with open(os.path.join(resources, "RegisteredResources", "logo.png"), "wb") as f:
+                f.write(logo)
+            item_type = "Report"
+        with open(os.path.join(folder, ".platform"), "w") as f:
+            json.dump({"metadata": {"type": item_type, "displayName": os.path.basename(folder).split(".")[0]}}, f)
+
+    def git(*args):
+        subprocess.run(["git", "-C", repo, *args], check=True, capture_output=True)
+
+    git("init", "--quiet", "--initial-branch", BRANCH)
+    git("add", "-A")
+    git("-c", "user.name=bench", "-c", "user.email=bench@example.com", "commit", "--quiet", "-m", "Synthetic items")
+    return repo
+
+
+def measure(server: MockFabricServer, run: Callable[[], Dict]) -> Dict:
+    """
+    Run a deployment and record wall time, server-side request count and peak Python memory.
+    Peak memory is traced for the whole process, so it includes the in-process mock server.
+
+    Args:
+        server: Running mock Fabric server
+        run: Callable performing the deployment and returning its summary
+
+    Returns:
+        Dict: Measurements plus the deployed/failed counts from the summary
+    """
+    requests_before = server.state.request_count
+    throttled_before = server.state.throttled_count
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        summary = run()
+        wall_time = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "deployed": summary.get("success", 0),
+        "failed": summary.get("failed", 0),
+        "wall_time_s": round(wall_time, 3),
+        "requests": server.state.request_count - requests_before,
+        "throttled": server.state.throttled_count - throttled_before,
+        "retries": summary.get("retries", 0),
+        "peak_memory_mb": round(peak / (1024 * 1024), 2)
+    }
+
+
+def create_manager(server: MockFabricServer, work_dir: str) -> FabricDeploymentManager:
+    return FabricDeploymentManager(
+        tenant_id="bench-tenant",
+        client_id="bench-client",
+        client_secret="bench-secret",
+        capacity_id="bench-capacity",
+        fabric_api_base=f"{server.base_url}/v1",
+        authority_host=server.base_url,
+        repo_cache_dir=os.path.join(work_dir, "mirrors"),
+        blob_cache=DefinitionBlobCache(os.path.join(work_dir, "blobs"))
+    )
+
+
+def run_github_deploy(server: MockFabricServer, work_dir: str, item_count: int, max_workers: int) -> Dict:
+    """
+    Benchmark deploy_items_from_github against a synthetic repository.
+
+    Args:
+        server: Running mock Fabric server
+        work_dir: Scratch directory for the repository, mirror cache and checkout
+        item_count: Number of items in the synthetic repository
+        max_workers: Concurrent item deployments
+
+    Returns:
+        Dict: Benchmark result
+    """
+    repo = build_synthetic_repo(work_dir, item_count)
+    target = server.state.add_workspace(f"Bench-GitHub-{item_count}")
+    manager = create_manager(server, work_dir)
+    # get_items_from_github checks out into the working directory
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        result = measure(server, lambda: manager.deploy_items_from_github(
+            repo_url=repo,
+            branch=BRANCH,
+            target_workspace_id=target["id"],
+            max_workers=max_workers
+        ))
+    finally:
+        os.chdir(cwd)
+        manager.close()
+    return {"scenario": "deploy_items_from_github", "items": item_count, **result}
+
+
+def run_workspace_deploy(server: MockFabricServer, work_dir: str, item_count: int, max_workers: int) -> Dict:
+    """
+    Benchmark deploy_items (copyTo) between two mock workspaces.
+
+    Args:
+        server: Running mock Fabric server
+        work_dir: Scratch directory for the manager's caches
+        item_count: Number of items in the source workspace
+        max_workers: Concurrent item copies
+
+    Returns:
+        Dict: Benchmark result
+    """
+    source = server.state.add_workspace(f"Bench-Dev-{item_count}")
+    target = server.state.add_workspace(f"Bench-Prod-{item_count}")
+    for i in range(item_count):
+        server.state.add_item(source["id"], f"Item {i}", "Report" if i % 2 else "SemanticModel")
+
+    manager = create_manager(server, work_dir)
+    try:
+        result = measure(server, lambda: manager.deploy_items(source["id"], target["id"], max_workers=max_workers))
+    finally:
+        manager.close()
+    return {"scenario": "deploy_items", "items": item_count, **result}
+
+
+def main():
+    """
+    Run the end-to-end deployment benchmarks against a local mock Fabric API.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark Fabric deployments end to end against a local mock server")
+    parser.add_argument("--sizes", default="10,100,1000", help="Comma-separated item counts")
+    parser.add_argument("--max-workers", type=int, default=8, help="Concurrent item deployments")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Latency added to every mock API request")
+    parser.add_argument("--lro-seconds", type=float, default=0.0,
+                        help="If set, item creation returns 202 and completes after this many seconds")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--scenarios", default="github,workspace", help="github and/or workspace")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    logging.getLogger("FabricDeploymentManager").setLevel(logging.WARNING)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    scenarios = {scenario.strip() for scenario in args.scenarios.split(",")}
+
+    server = MockFabricServer(
+        request_latency=args.latency_ms / 1000,
+        lro_duration=args.lro_seconds,
+        throttle_rate=args.throttle_rate,
+        seed=0
+    ).start()
+    results: List[Dict] = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="fabric-bench-") as work_dir:
+            for size in sizes:
+                if "github" in scenarios:
+                    results.append(run_github_deploy(server, os.path.join(work_dir, f"github-{size}"), size, args.max_workers))
+                if "workspace" in scenarios:
+                    results.append(run_workspace_deploy(server, os.path.join(work_dir, f"workspace-{size}"), size, args.max_workers))
+    finally:
+        server.stop()
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
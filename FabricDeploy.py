@@ -0,0 +1,388 @@
+import sys
+import json
+import logging
+import argparse
+import importlib
+from typing import Dict, List, Optional
+
+from FabricDeploymentManager import (
+    FabricDeploymentManager,
+    create_manager_from_config,
+    deploy_fan_out,
+    load_config_from_env,
+    log_deployment_summary,
+    requests,
+    write_run_profile
+)
+
+logger = logging.getLogger(__name__)
+
+# bench subcommand -> benchmark script whose main() it runs
+BENCHMARKS = {
+    "deploy": "DeploymentBenchmark",
+    "transport": "TransportBenchmark",
+    "startup": "ImportTimeBenchmark"
+}
+
+
+def parse_item_types(value: Optional[str]) -> Optional[List[str]]:
+    """
+    Split a comma-separated --item-types value.
+
+    Args:
+        value: e.g. "Report,SemanticModel"
+
+    Returns:
+        List: Item types, or None for all types
+    """
+    if not value:
+        return None
+    return [item_type.strip() for item_type in value.split(",") if item_type.strip()]
+
+
+def load_role_entries(path: Optional[str], assignments: Optional[List[str]], principal_type: str) -> List[Dict]:
+    """
+    Collect the desired role assignments from a JSON file and/or --assign options.
+
+    Args:
+        path: JSON file holding a list of {principal, type, role} entries (or {"roles": [...]})
+        assignments: PRINCIPAL:ROLE values given on the command line
+        principal_type: Principal type for the --assign values
+
+    Returns:
+        List: Entries for reconcile_role_assignments
+    """
+    entries = []
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        entries.extend(data.get("roles", []) if isinstance(data, dict) else data)
+    for value in assignments or []:
+        principal, separator, role = value.rpartition(":")
+        if not separator or not principal or not role:
+            raise ValueError(f"--assign expects PRINCIPAL:ROLE, got '{value}'")
+        entries.append({"principal": principal, "type": principal_type, "role": role})
+    return entries
+
+
+def resolve_workspace_id(manager: FabricDeploymentManager, args, config: Dict, create: bool = False) -> Optional[str]:
+    """
+    Resolve the target workspace from --workspace-id/--workspace or the configured Prod workspace.
+
+    Args:
+        manager: Deployment manager
+        args: Parsed command-line arguments
+        config: Configuration from load_config_from_env
+        create: Create the workspace if it doesn't exist
+
+    Returns:
+        str: Workspace ID, or None if it could not be found or created
+    """
+    if getattr(args, "workspace_id", None):
+        return args.workspace_id
+    name = getattr(args, "workspace", None)
+    if not name and config["prod_workspace_id"]:
+        return config["prod_workspace_id"]
+    name = name or config["prod_workspace_name"]
+
+    if create:
+        workspace = manager.create_workspace(name, capacity_id=getattr(args, "capacity_id", None))
+    else:
+        try:
+            workspace = manager.workspace_directory.find(name)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"✗ Failed to retrieve workspaces: {str(e)}")
+            return None
+    if not workspace:
+        logger.error(f"✗ Workspace '{name}' {'could not be created' if create else 'not found'}")
+        return None
+    return workspace["id"]
+
+
+def cmd_workspace_ensure(manager: FabricDeploymentManager, config: Dict, args) -> int:
+    workspace_id = resolve_workspace_id(manager, args, config, create=True)
+    if not workspace_id:
+        return 1
+    print(json.dumps({"id": workspace_id}))
+    return 0
+
+
+def cmd_roles_sync(manager: FabricDeploymentManager, config: Dict, args) -> int:
+    desired = load_role_entries(args.roles_file, args.assign, args.principal_type)
+    if not desired:
+        logger.error("✗ No role assignments given (use --roles-file and/or --assign)")
+        return 1
+    workspace_id = resolve_workspace_id(manager, args, config)
+    if not workspace_id:
+        return 1
+
+    report = manager.reconcile_role_assignments(workspace_id, desired, args.remove_unlisted, args.dry_run)
+    if report is None:
+        return 1
+    logger.info(f"Roles: {len(report['added'])} added, {len(report['updated'])} updated, "
+                f"{len(report['removed'])} removed, {len(report['unchanged'])} unchanged, {len(report['failed'])} failed")
+    return 1 if report["failed"] else 0
+
+
+def cmd_items_deploy(manager: FabricDeploymentManager, config: Dict, args) -> int:
+    if config["targets_file"]:
+        summary = deploy_fan_out(manager, config)
+        failed_workspaces = [workspace for workspace in summary["workspaces"] if workspace["status"] == "failed"]
+        return 1 if summary["failed"] or failed_workspaces else 0
+
+    workspace_id = resolve_workspace_id(manager, args, config, create=True)
+    if not workspace_id:
+        return 1
+
+    with manager.tracer.span("deploy", {"fabric.workspace.id": workspace_id}) as span:
+        if args.source_workspace_id:
+            ignored = [name for name in ("incremental", "resume", "prune") if config[name]]
+            if ignored:
+                # Only set through the environment here; the command line rejects them in main()
+                logger.warning(f"⊘ {', '.join(ignored)} not supported when copying from a workspace; ignored")
+            summary = manager.deploy_items(
+                args.source_workspace_id,
+                workspace_id,
+                item_types=parse_item_types(args.item_types),
+                max_workers=config["max_workers"]
+            )
+        else:
+            summary = manager.deploy_items_from_github(
+                repo_url=config["repo_url"],
+                branch=config["branch"],
+                target_workspace_id=workspace_id,
+                item_types=parse_item_types(args.item_types),
+                max_workers=config["max_workers"],
+                incremental=config["incremental"],
+                state_file=config["state_file"],
+                journal_file=config["journal_file"],
+                resume=config["resume"],
+                prune=config["prune"],
+                max_deletions=config["max_deletions"]
+            )
+        span.set_attribute("fabric.items.deployed", summary["success"])
+        span.set_attribute("fabric.items.failed", summary["failed"])
+
+    log_deployment_summary(manager, summary)
+    return 1 if summary["failed"] else 0
+
+
+def cmd_items_plan(manager: FabricDeploymentManager, config: Dict, args) -> int:
+    workspace_id = resolve_workspace_id(manager, args, config)
+    if not workspace_id:
+        return 1
+    plan = manager.plan_deployment(
+        workspace_id,
+        repo_url=config["repo_url"],
+        branch=config["branch"],
+        dev_path=args.dev_path,
+        item_types=parse_item_types(args.item_types),
+        max_workers=config["max_workers"],
+        state_file=config["state_file"]
+    )
+    if plan is None:
+        return 1
+
+    for action, symbol in (("create", "+"), ("update", "~"), ("orphan", "-")):
+        for entry in plan[action]:
+            logger.info(f"{symbol} {entry['type']}: {entry['name']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(plan, f, indent=2)
+        logger.info(f"✓ Plan written to {args.output}")
+    if args.json:
+        print(json.dumps(plan, indent=2))
+    changes = plan["summary"]["create"] + plan["summary"]["update"] + plan["summary"]["orphan"]
+    return 2 if args.detailed_exitcode and changes else 0
+
+
+def cmd_orphans_prune(manager: FabricDeploymentManager, config: Dict, args) -> int:
+    workspace_id = resolve_workspace_id(manager, args, config)
+    if not workspace_id:
+        return 1
+    repo_items = manager.get_items_from_path(args.dev_path) if args.dev_path else \
+        manager.get_items_from_github(repo_url=config["repo_url"], branch=config["branch"])
+
+    report = manager.prune_orphans(
+        workspace_id,
+        repo_items,
+        item_types=parse_item_types(args.item_types),
+        max_workers=config["max_workers"],
+        max_deletions=config["max_deletions"],
+        dry_run=not args.yes
+    )
+    if report is None or report["blocked"]:
+        return 1
+    if not args.yes and report["orphans"]:
+        logger.info(f"{len(report['orphans'])} orphan(s) found; pass --yes to delete them")
+    return 1 if report["failed"] else 0
+
+
+def cmd_bench(args) -> int:
+    module = importlib.import_module(BENCHMARKS[args.benchmark])
+    # The benchmark scripts parse sys.argv themselves
+    sys.argv = [f"{module.__name__}.py", *[arg for arg in args.bench_args if arg != "--"]]
+    return module.main()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser with the workspace, roles, items, orphans and bench subcommands.
+
+    Returns:
+        argparse.ArgumentParser: The parser
+    """
+    # Options shared by every subcommand; they override the matching environment variables
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--max-workers", type=int, help="Concurrent item operations (DEPLOY_MAX_WORKERS)")
+    common.add_argument("--pool-maxsize", type=int, help="Keep-alive connections per host (FABRIC_POOL_MAXSIZE)")
+    common.add_argument("--profile", help="Write the run profile (JSON) to this file")
+
+    target = argparse.ArgumentParser(add_help=False)
+    target.add_argument("--workspace", help="Target workspace name (PROD_WORKSPACE_NAME)")
+    target.add_argument("--workspace-id", help="Target workspace ID (PROD_WORKSPACE_ID)")
+
+    source = argparse.ArgumentParser(add_help=False)
+    source.add_argument("--repo-url", help="Repository holding the Development folder (GITHUB_REPO_URL)")
+    source.add_argument("--branch", help="Branch to deploy (GITHUB_BRANCH)")
+    source.add_argument("--item-types", help="Comma-separated item types in scope (all if omitted)")
+
+    local = argparse.ArgumentParser(add_help=False)
+    local.add_argument("--dev-path", help="Use this local Development folder instead of fetching the repository")
+
+    parser = argparse.ArgumentParser(prog="FabricDeploy.py", description="Deploy and manage Microsoft Fabric workspaces")
+    commands = parser.add_subparsers(dest="group", required=True)
+
+    workspace = commands.add_parser("workspace", help="Workspace commands").add_subparsers(dest="command", required=True)
+    ensure = workspace.add_parser("ensure", parents=[common, target], help="Find or create the workspace")
+    ensure.add_argument("--capacity-id", help="Capacity for a new workspace (CAPACITY_ID_ENV)")
+    ensure.set_defaults(handler=cmd_workspace_ensure)
+
+    roles = commands.add_parser("roles", help="Role assignment commands").add_subparsers(dest="command", required=True)
+    sync = roles.add_parser("sync", parents=[common, target], help="Reconcile workspace role assignments")
+    sync.add_argument("--roles-file", help="JSON list of {principal, type, role} entries")
+    sync.add_argument("--assign", action="append", metavar="PRINCIPAL:ROLE", help="Desired assignment (repeatable)")
+    sync.add_argument("--principal-type", default="User", help="Principal type for --assign (User, Group, ServicePrincipal)")
+    sync.add_argument("--remove-unlisted", action="store_true", help="Remove assignments that are not listed")
+    sync.add_argument("--dry-run", action="store_true", help="Only report the changes")
+    sync.set_defaults(handler=cmd_roles_sync)
+
+    items = commands.add_parser("items", help="Item commands").add_subparsers(dest="command", required=True)
+    deploy = items.add_parser("deploy", parents=[common, target, source], help="Deploy items to the workspace")
+    deploy.add_argument("--source-workspace-id", help="Copy items from this workspace instead of the repository")
+    deploy.add_argument("--targets-file", help="Fan out to every workspace in this JSON file (DEPLOY_TARGETS_FILE)")
+    deploy.add_argument("--incremental", action="store_true", help="Only deploy changed items (DEPLOY_INCREMENTAL)")
+    deploy.add_argument("--resume", action="store_true", help="Continue an interrupted deployment (DEPLOY_RESUME)")
+    deploy.add_argument("--prune", action="store_true",
+                        help="Delete orphaned items after a successful deployment (DEPLOY_PRUNE_ORPHANS)")
+    deploy.add_argument("--max-deletions", type=int,
+                        help="Delete nothing if there are more orphans than this, 0 for no limit (DEPLOY_MAX_DELETIONS)")
+    deploy.set_defaults(handler=cmd_items_deploy)
+    plan = items.add_parser("plan", aliases=["diff"], parents=[common, target, source, local],
+                            help="Show what a deployment would create, update or orphan, without deploying")
+    plan.add_argument("--json", action="store_true", help="Print the plan as JSON")
+    plan.add_argument("--output", help="Write the plan (JSON) to this file")
+    plan.add_argument("--detailed-exitcode", action="store_true",
+                      help="Exit with 2 when the plan has changes (0 when there are none, 1 on errors)")
+    plan.set_defaults(handler=cmd_items_plan)
+
+    orphans = commands.add_parser("orphans", help="Orphan commands").add_subparsers(dest="command", required=True)
+    prune = orphans.add_parser("prune", parents=[common, target, source, local],
+                               help="Delete workspace items that are no longer in the repository")
+    prune.add_argument("--yes", action="store_true", help="Delete the orphans (default only lists them)")
+    prune.add_argument("--max-deletions", type=int,
+                       help="Delete nothing if there are more orphans than this, 0 for no limit (DEPLOY_MAX_DELETIONS)")
+    prune.set_defaults(handler=cmd_orphans_prune)
+
+    bench = commands.add_parser("bench", help="Run a benchmark against the local mock server")
+    bench.add_argument("benchmark", choices=sorted(BENCHMARKS), help="Benchmark to run")
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER, help="Arguments passed to the benchmark")
+    return parser
+
+
+def apply_overrides(config: Dict, args) -> Dict:
+    """
+    Apply command-line options on top of the environment configuration.
+
+    Args:
+        config: Configuration from load_config_from_env
+        args: Parsed command-line arguments
+
+    Returns:
+        Dict: The updated configuration
+    """
+    overrides = {
+        "max_workers": args.max_workers,
+        "pool_maxsize": args.pool_maxsize,
+        "repo_url": getattr(args, "repo_url", None),
+        "branch": getattr(args, "branch", None),
+        "targets_file": getattr(args, "targets_file", None)
+    }
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    config["incremental"] = config["incremental"] or getattr(args, "incremental", False)
+    config["resume"] = config["resume"] or getattr(args, "resume", False)
+    config["prune"] = config["prune"] or getattr(args, "prune", False)
+    if getattr(args, "max_deletions", None) is not None:
+        config["max_deletions"] = args.max_deletions
+    return config
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run one subcommand with a single manager: every command shares the pooled transport,
+    token cache and concurrency settings.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.group == "items" and args.command == "deploy" and args.source_workspace_id:
+        # Copying between workspaces has no repository state to diff, journal or prune against
+        conflicting = [option for option, value in (("--targets-file", args.targets_file),
+                                                    ("--incremental", args.incremental),
+                                                    ("--resume", args.resume),
+                                                    ("--prune", args.prune)) if value]
+        if conflicting:
+            parser.error(f"--source-workspace-id cannot be combined with {', '.join(conflicting)}")
+    if args.group == "bench":
+        return cmd_bench(args)
+
+    config = apply_overrides(load_config_from_env(), args)
+    # Deployments always leave a profile behind; other commands only when asked
+    profile_file = args.profile or (config["profile_file"] if args.group == "items" and args.command == "deploy" else None)
+    manager = create_manager_from_config(config)
+    try:
+        with manager.tracer.span(f"{args.group}.{args.command}"):
+            return args.handler(manager, config, args)
+    finally:
+        if profile_file:
+            write_run_profile(manager.profiler, profile_file)
+        manager.close()
+
+
+def run_commands(commands: List[List[str]]) -> int:
+    """
+    Run several subcommands in order, stopping at the first one that fails.
+    The older step scripts are thin wrappers around this.
+
+    Args:
+        commands: Argument lists, one per subcommand
+
+    Returns:
+        int: Exit code of the first failing command, or 0
+    """
+    for argv in commands:
+        code = main(argv)
+        if code:
+            return code
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import logging
+import argparse
+import compileall
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Entry points and the heavy dependencies they must not pull in just by being imported
+DEFAULT_MODULES = ["FabricDeploy", "FabricDeploymentManager", "Step1to5", "Step1to5Test", "Test"]
+DEFAULT_FORBIDDEN = ["requests", "urllib3", "dotenv", "azure.identity", "fabric_cicd", "git",
+                     "aiohttp", "opentelemetry", "email.utils"]
+
+# requests is still used eagerly by Step1to5Test; the library and the wrapper scripts are held to the full list
+FORBIDDEN_OVERRIDES = {
+    "Step1to5Test": ["dotenv", "azure.identity", "fabric_cicd", "git"]
+}
+
+# Median cumulative import budgets; Step1to5Test carries requests (~100ms) on top of the library
+DEFAULT_BUDGET_MS = 250
+BUDGETS_MS = {"FabricDeploy": 75, "FabricDeploymentManager": 75, "Step1to5": 75, "Test": 75}
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse the output of `python -X importtime`.
+
+    Args:
+        stderr: Standard error of the interpreter run
+
+    Returns:
+        Dict: Module name -> (self microseconds, cumulative microseconds)
+    """
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure_import(module: str, python: str = sys.executable) -> Dict[str, Tuple[int, int]]:
+    """
+    Import a module in a fresh interpreter with -X importtime and return its timings.
+    Bytecode writing is left on so every run after the first measures a warm import.
+
+    Args:
+        module: Module to import
+        python: Interpreter to run
+
+    Returns:
+        Dict: Module name -> (self microseconds, cumulative microseconds)
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {result.stderr.strip().splitlines()[-1]}")
+    return parse_importtime(result.stderr)
+
+
+def benchmark_module(module: str, repeat: int, forbidden: List[str]) -> Dict:
+    """
+    Measure the cumulative import time of a module and list forbidden modules it loads.
+
+    Args:
+        module: Module to import
+        repeat: Number of fresh-interpreter runs; the median is reported
+        forbidden: Top-level packages or modules that must stay off the import path
+
+    Returns:
+        Dict: Median/min cumulative milliseconds, slowest children and forbidden imports
+    """
+    compileall.compile_file(os.path.join(ROOT, f"{module}.py"), quiet=1)
+    runs = [measure_import(module) for _ in range(repeat)]
+    cumulative = [run[module][1] / 1000 for run in runs]
+
+    loaded = set(runs[-1])
+    violations = sorted(name for name in forbidden if name in loaded)
+    slowest = sorted(
+        ((name, timing[1]) for name, timing in runs[-1].items() if name != module),
+        key=lambda entry: entry[1], reverse=True
+    )[:5]
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(cumulative), 2),
+        "min_ms": round(min(cumulative), 2),
+        "slowest_imports": [{"module": name, "cumulative_ms": round(us / 1000, 2)} for name, us in slowest],
+        "forbidden_imports": violations
+    }
+
+
+def main():
+    """
+    Guard CLI startup latency: import each entry point with -X importtime and fail if it
+    exceeds the budget or eagerly loads a heavy dependency.
+    """
+    parser = argparse.ArgumentParser(description="Measure and guard import time of the deployment entry points")
+    parser.add_argument("--modules", default=",".join(DEFAULT_MODULES), help="Comma-separated modules to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh-interpreter runs per module")
+    parser.add_argument("--budget-ms", type=float, default=os.getenv("IMPORT_BUDGET_MS"),
+                        help="Maximum median cumulative import time for every module (overrides the per-module budgets)")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    modules = [module.strip() for module in args.modules.split(",") if module.strip()]
+
+    results = []
+    failed = False
+    for module in modules:
+        result = benchmark_module(module, args.repeat, FORBIDDEN_OVERRIDES.get(module, DEFAULT_FORBIDDEN))
+        budget = args.budget_ms or BUDGETS_MS.get(module, DEFAULT_BUDGET_MS)
+        result["budget_ms"] = budget
+        results.append(result)
+        over_budget = result["median_ms"] > budget
+        if result["forbidden_imports"]:
+            logger.error(f"✗ {module} imports {', '.join(result['forbidden_imports'])} at import time")
+        if over_budget:
+            logger.error(f"✗ {module} imports in {result['median_ms']}ms (budget {budget}ms)")
+        if result["forbidden_imports"] or over_budget:
+            failed = True
+        else:
+            logger.info(f"✓ {module}: {result['median_ms']}ms")
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,560 @@
+import json
+import argparse
+import socket
+import re
+import time
+import uuid
+import random
+import logging
+import threading
+from typing import Dict, List, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class MockFabricState:
+    """
+    In-memory state of the mock Fabric tenant (workspaces and their items).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.workspaces: Dict[str, Dict] = {}
+        self.items: Dict[str, List[Dict]] = {}
+        self.operations: Dict[str, Dict] = {}
+        self.role_assignments: Dict[str, Dict[str, Dict]] = {}
+        self.principals: Dict[str, Dict[str, str]] = {"users": {}, "groups": {}, "servicePrincipals": {}}
+        self.request_count = 0
+        self.connection_count = 0
+        self.throttled_count = 0
+        self.request_log: List[str] = []
+
+    def add_workspace(self, display_name: str, workspace_id: Optional[str] = None) -> Dict:
+        """
+        Create a workspace in the mock tenant.
+
+        Args:
+            display_name: Workspace display name
+            workspace_id: Optional fixed workspace ID
+
+        Returns:
+            Dict: The created workspace
+        """
+        with self.lock:
+            workspace = {
+                "id": workspace_id or str(uuid.uuid4()),
+                "displayName": display_name,
+                "type": "Workspace"
+            }
+            self.workspaces[workspace["id"]] = workspace
+            self.items.setdefault(workspace["id"], [])
+            return workspace
+
+    def add_item(self, workspace_id: str, display_name: str, item_type: str, description: str = "") -> Dict:
+        """
+        Create an item in a mock workspace.
+
+        Args:
+            workspace_id: ID of the workspace
+            display_name: Item display name
+            item_type: Fabric item type
+            description: Item description
+
+        Returns:
+            Dict: The created item
+        """
+        with self.lock:
+            item = {
+                "id": str(uuid.uuid4()),
+                "displayName": display_name,
+                "type": item_type,
+                "description": description,
+                "workspaceId": workspace_id
+            }
+            self.items.setdefault(workspace_id, []).append(item)
+            return item
+
+
+    def add_principal(self, name: str, collection: str = "users") -> str:
+        """
+        Register a directory object that Graph lookups can resolve.
+
+        Args:
+            name: UPN/email (users) or display name (groups, servicePrincipals)
+            collection: Graph collection: users, groups or servicePrincipals
+
+        Returns:
+            str: The object ID
+        """
+        with self.lock:
+            object_id = str(uuid.uuid4())
+            self.principals[collection][name.lower()] = object_id
+            return object_id
+
+    def add_operation(self, result: Optional[Dict], duration: float) -> Dict:
+        """
+        Register a long-running operation that succeeds after duration seconds.
+
+        Args:
+            result: Payload returned by the operation's /result endpoint
+            duration: Seconds until the operation reports Succeeded
+
+        Returns:
+            Dict: The operation record
+        """
+        with self.lock:
+            operation = {
+                "id": str(uuid.uuid4()),
+                "result": result,
+                "done_at": time.monotonic() + duration
+            }
+            self.operations[operation["id"]] = operation
+            return operation
+
+
+class MockFabricRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles the subset of the Fabric REST API used by FabricDeploymentManager.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        # Called once per TCP connection: simulate the TLS handshake cost
+        super().setup()
+        # Headers and body are written separately; avoid Nagle/delayed-ACK stalls on keep-alive
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.state.lock:
+            self.server.state.connection_count += 1
+        if self.server.handshake_latency:
+            time.sleep(self.server.handshake_latency)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send_json(self, status: int, body: Optional[Dict] = None, headers: Optional[Dict] = None):
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def _read_body(self) -> Dict:
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        if not length:
+            return {}
+        raw = self.rfile.read(length)
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return {}
+
+    def _send_created(self, item: Dict):
+        # Either 201 Created, or 202 Accepted with an operation to poll when LRO mode is on
+        if not self.server.lro_duration:
+            self._send_json(201, item)
+            return
+        operation = self.server.state.add_operation(item, self.server.lro_duration)
+        self._send_json(202, headers={
+            "Location": f"{self.server.base_url}/v1/operations/{operation['id']}",
+            "x-ms-operation-id": operation["id"],
+            "Retry-After": "1"
+        })
+
+    def _find_item_by_id(self, workspace_id: str, item_id: str) -> Optional[Dict]:
+        return next((i for i in self.server.state.items.get(workspace_id, []) if i["id"] == item_id), None)
+
+    def _find_item_by_name(self, workspace_id: str, item_type: str, display_name: str) -> Optional[Dict]:
+        return next((i for i in self.server.state.items.get(workspace_id, [])
+                     if i["type"] == item_type and i["displayName"] == display_name), None)
+
+    def _graph_lookup(self, request: Dict) -> Dict:
+        # Only the "$filter=... eq '<name>'" lookups used by PrincipalResolver are understood
+        parsed = urlparse(request.get("url", ""))
+        collection = parsed.path.strip("/")
+        query = parse_qs(parsed.query).get("$filter", [""])[0]
+        match = re.search(r"eq '((?:[^']|'')*)'", query)
+        name = match.group(1).replace("''", "'").lower() if match else ""
+        object_id = self.server.state.principals.get(collection, {}).get(name)
+        return {
+            "id": request.get("id"),
+            "status": 200,
+            "body": {"value": [{"id": object_id}] if object_id else []}
+        }
+
+    def _before_request(self, path: str) -> bool:
+        # Returns False when the request was answered with an injected 429 or fault
+        with self.server.state.lock:
+            self.server.state.request_count += 1
+            self.server.state.request_log.append(f"{self.command} {path}")
+        if self.server.request_latency:
+            time.sleep(self.server.request_latency)
+        fault = self.server.take_fault(self.command, path)
+        if fault is not None:
+            status, retry_after = fault
+            self._send_json(status, {"errorCode": "InjectedFault", "message": f"Injected {status}"},
+                            headers={"Retry-After": f"{retry_after:g}"} if retry_after is not None else None)
+            return False
+        if path.endswith("/oauth2/v2.0/token") or not self.server.should_throttle():
+            return True
+        with self.server.state.lock:
+            self.server.state.throttled_count += 1
+        self._send_json(429, {"errorCode": "RequestBlocked", "message": "Too many requests"},
+                        headers={"Retry-After": f"{self.server.throttle_retry_after:g}"})
+        return False
+
+    def _group_user(self, assignment: Dict) -> Dict:
+        # Power BI groups/users view of a role assignment
+        principal = assignment.get("principal", {})
+        user = {
+            "identifier": principal.get("id"),
+            "principalType": principal.get("type"),
+            "groupUserAccessRight": assignment.get("role")
+        }
+        if "@" in str(principal.get("id")):
+            user["emailAddress"] = principal["id"]
+        return user
+
+    def _send_page(self, path: str, query: str, values: List[Dict]):
+        page_size = self.server.page_size
+        if not page_size:
+            self._send_json(200, {"value": values})
+            return
+        # The continuation token is simply the offset of the next page
+        offset = int(parse_qs(query).get("continuationToken", ["0"])[0])
+        body = {"value": values[offset:offset + page_size]}
+        if offset + page_size < len(values):
+            body["continuationToken"] = str(offset + page_size)
+            body["continuationUri"] = f"{self.server.base_url}{path}?continuationToken={offset + page_size}"
+        self._send_json(200, body)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path = parsed.path
+        state = self.server.state
+        if not self._before_request(path):
+            return
+
+        if path == "/v1/workspaces":
+            self._send_page(path, parsed.query, list(state.workspaces.values()))
+            return
+
+        match = re.fullmatch(r"/v1/workspaces/([^/]+)", path)
+        if match:
+            workspace = state.workspaces.get(match.group(1))
+            self._send_json(200 if workspace else 404, workspace or {"errorCode": "WorkspaceNotFound"})
+            return
+
+        match = re.fullmatch(r"/v1/workspaces/([^/]+)/items", path)
+        if match:
+            self._send_page(path, parsed.query, list(state.items.get(match.group(1), [])))
+            return
+
+        match = re.fullmatch(r"/v1/workspaces/([^/]+)/items/([^/]+)", path)
+        if match:
+            item = next((i for i in state.items.get(match.group(1), []) if i["id"] == match.group(2)), None)
+            self._send_json(200 if item else 404, item or {"errorCode": "ItemNotFound"})
+            return
+
+        match = re.fullmatch(r"/v1/workspaces/([^/]+)/roleAssignments", path)
+        if match:
+            self._send_json(200, {"value": list(state.role_assignments.get(match.group(1), {}).values())})
+            return
+
+        match = re.fullmatch(r"/v1\.0/myorg/groups/([^/]+)/users", path)
+        if match:
+            assignments = state.role_assignments.get(match.group(1), {}).values()
+            self._send_json(200, {"value": [self._group_user(assignment) for assignment in assignments]})
+            return
+
+        match = re.fullmatch(r"/v1/operations/([^/]+)(/result)?", path)
+        if match and match.group(1) in state.operations:
+            operation = state.operations[match.group(1)]
+            done = time.monotonic() >= operation["done_at"]
+            if match.group(2):
+                self._send_json(200 if done else 400, operation["result"] if done else {"errorCode": "OperationNotSucceeded"})
+            else:
+                self._send_json(200, {"status": "Succeeded" if done else "Running"})
+            return
+
+        self._send_json(404, {"errorCode": "NotFound", "message": path})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        state = self.server.state
+        # Always drain the body so the keep-alive connection stays usable after an injected 429
+        body = self._read_body()
+        if not self._before_request(path):
+            return
+
+        if path == "/v1.0/$batch":
+            self._send_json(200, {"responses": [self._graph_lookup(request) for request in body.get("requests", [])]})
+            return
+
+        if re.fullmatch(r"/[^/]+/oauth2/v2\.0/token", path):
+            # Token endpoint sends form data; the body is simply ignored
+            self._send_json(200, {"access_token": "mock-token", "expires_in": 3600})
+            return
+
+        if path == "/v1/workspaces":
+            display_name = body.get("displayName", "Workspace")
+            if any(ws["displayName"].lower() == display_name.lower() for ws in state.workspaces.values()):
+                self._send_json(409, {"errorCode": "WorkspaceNameAlreadyExists"})
+                return
+            self._send_json(201, state.add_workspace(display_name))
+            return
+
+        match = re.fullmatch(r"/v1/workspaces/([^/]+)/items", path)
+        if match:
+            if self._find_item_by_name(match.group(1), body.get("type"), body.get("displayName")):
+                self._send_json(409, {"errorCode": "ItemDisplayNameAlreadyInUse"})
+                return
+            item = state.add_item(match.group(1), body.get("displayName"), body.get("type"), body.get("description", ""))
+            self._send_created(item)
+            return
+
+        match = re.fullmatch(r"/v1/workspaces/([^/]+)/items/([^/]+)/updateDefinition", path)
+        if match:
+            item = self._find_item_by_id(match.group(1), match.group(2))
+            if item is None:
+                self._send_json(404, {"errorCode": "ItemNotFound"})
+                return
+            with state.lock:
+                item["definitionUpdates"] = item.get("definitionUpdates", 0) + 1
+            if not self.server.lro_duration:
+                self._send_json(200, None)
+                return
+            # updateDefinition operations have no result payload
+            operation = state.add_operation(None, self.server.lro_duration)
+            self._send_json(202, headers={
+                "Location": f"{self.server.base_url}/v1/operations/{operation['id']}",
+                "x-ms-operation-id": operation["id"],
+                "Retry-After": "1"
+            })
+            return
+
+        match = re.fullmatch(r"/v1/workspaces/([^/]+)/items/([^/]+)/copyTo", path)
+        if match:
+            source = next((i for i in state.items.get(match.group(1), []) if i["id"] == match.group(2)), None)
+            if source is None:
+                self._send_json(404, {"errorCode": "ItemNotFound"})
+                return
+            item = state.add_item(body.get("targetWorkspaceId"), body.get("displayName"), source["type"])
+            self._send_created(item)
+            return
+
+        match = re.fullmatch(r"/v1/workspaces/([^/]+)/roleAssignments", path)
+        if match:
+            principal_id = body.get("principal", {}).get("id")
+            with state.lock:
+                assignments = state.role_assignments.setdefault(match.group(1), {})
+                if principal_id in assignments:
+                    self._send_json(409, {"errorCode": "PrincipalAlreadyHasWorkspaceRolePermissions"})
+                    return
+                # Fabric uses the principal ID as the role assignment ID
+                assignments[principal_id] = {"id": principal_id, **body}
+            self._send_json(201, assignments[principal_id])
+            return
+
+        match = re.fullmatch(r"/v1\.0/myorg/groups/([^/]+)/users", path)
+        if match:
+            principal_id = body.get("identifier") or body.get("emailAddress")
+            with state.lock:
+                # Power BI adds or updates the user in one call
+                state.role_assignments.setdefault(match.group(1), {})[principal_id] = {
+                    "id": principal_id,
+                    "principal": {"id": principal_id, "type": body.get("principalType", "User")},
+                    "role": body.get("groupUserAccessRight", "Viewer")
+                }
+            self._send_json(200, None)
+            return
+
+        self._send_json(404, {"errorCode": "NotFound", "message": path})
+
+    def do_PATCH(self):
+        path = urlparse(self.path).path
+        state = self.server.state
+        body = self._read_body()
+        if not self._before_request(path):
+            return
+
+        match = re.fullmatch(r"/v1/workspaces/([^/]+)/items/([^/]+)", path)
+        if match:
+            item = self._find_item_by_id(match.group(1), match.group(2))
+            if item is None:
+                self._send_json(404, {"errorCode": "ItemNotFound"})
+                return
+            with state.lock:
+                item.update({key: body[key] for key in ("displayName", "description") if key in body})
+            self._send_json(200, item)
+            return
+
+        match = re.fullmatch(r"/v1/workspaces/([^/]+)/roleAssignments/([^/]+)", path)
+        if match:
+            assignment = state.role_assignments.get(match.group(1), {}).get(match.group(2))
+            if assignment is None:
+                self._send_json(404, {"errorCode": "RoleAssignmentNotFound"})
+                return
+            assignment["role"] = body.get("role", assignment["role"])
+            self._send_json(200, assignment)
+            return
+
+        self._send_json(404, {"errorCode": "NotFound", "message": path})
+
+    def do_DELETE(self):
+        path = urlparse(self.path).path
+        state = self.server.state
+        if not self._before_request(path):
+            return
+
+        match = re.fullmatch(r"/v1/workspaces/([^/]+)/items/([^/]+)", path)
+        if match:
+            with state.lock:
+                item = self._find_item_by_id(match.group(1), match.group(2))
+                if item is not None:
+                    state.items[match.group(1)].remove(item)
+            self._send_json(200 if item else 404, None if item else {"errorCode": "ItemNotFound"})
+            return
+
+        match = re.fullmatch(r"/v1/workspaces/([^/]+)/roleAssignments/([^/]+)", path)
+        if match:
+            with state.lock:
+                removed = state.role_assignments.get(match.group(1), {}).pop(match.group(2), None)
+            self._send_json(200 if removed else 404, None if removed else {"errorCode": "RoleAssignmentNotFound"})
+            return
+
+        self._send_json(404, {"errorCode": "NotFound", "message": path})
+
+
+class MockFabricServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the Fabric REST API, the Power BI groups/users endpoint,
+    Graph $batch lookups and the Azure AD token endpoint.
+    """
+
+    daemon_threads = True
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 handshake_latency: float = 0.0,
+                 request_latency: float = 0.0,
+                 lro_duration: float = 0.0,
+                 page_size: int = 0,
+                 throttle_rate: float = 0.0,
+                 throttle_retry_after: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        Initialize the mock server.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            handshake_latency: Seconds added once per new TCP connection
+            request_latency: Seconds added to every request
+            lro_duration: If set, item creation returns 202 and the operation succeeds after this many seconds
+            page_size: If set, GET /workspaces and GET /workspaces/{id}/items return pages of this size with a continuationToken
+            throttle_rate: Fraction of API requests (0-1) answered with 429 Too Many Requests
+            throttle_retry_after: Retry-After seconds sent with injected 429 responses
+            seed: Seed for the throttling decisions, for repeatable runs
+        """
+        super().__init__((host, port), MockFabricRequestHandler)
+        self.state = MockFabricState()
+        self.handshake_latency = handshake_latency
+        self.request_latency = request_latency
+        self.lro_duration = lro_duration
+        self.page_size = page_size
+        self.throttle_rate = throttle_rate
+        self.throttle_retry_after = throttle_retry_after
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._faults: List[Dict] = []
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def should_throttle(self) -> bool:
+        """
+        Decide whether the next API request gets an injected 429.
+        """
+        if not self.throttle_rate:
+            return False
+        with self._random_lock:
+            return self._random.random() < self.throttle_rate
+
+    def inject_fault(self, method: str, path_pattern: str, status: int, times: int = 1,
+                     retry_after: Optional[float] = None):
+        """
+        Answer the next matching requests with an error instead of handling them.
+
+        Args:
+            method: HTTP method to match
+            path_pattern: Regular expression the whole request path must match
+            status: Status code to answer with (e.g. 429 or 503)
+            times: Number of requests to fail
+            retry_after: Retry-After seconds to send (omitted if None)
+        """
+        with self._random_lock:
+            self._faults.append({"method": method.upper(), "pattern": re.compile(path_pattern),
+                                 "status": status, "remaining": times, "retry_after": retry_after})
+
+    def take_fault(self, method: str, path: str) -> Optional[tuple]:
+        """
+        Consume an injected fault matching the request.
+
+        Returns:
+            tuple: (status, retry_after), or None if the request should be handled normally
+        """
+        with self._random_lock:
+            for fault in self._faults:
+                if fault["remaining"] and fault["method"] == method and fault["pattern"].fullmatch(path):
+                    fault["remaining"] -= 1
+                    return fault["status"], fault["retry_after"]
+        return None
+
+    def start(self) -> "MockFabricServer":
+        """
+        Serve requests on a background thread.
+
+        Returns:
+            MockFabricServer: The running server
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving and release the socket.
+        """
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Run the mock Fabric API locally")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--request-latency-ms", type=float, default=0.0, help="Latency added to every request")
+    parser.add_argument("--lro-seconds", type=float, default=0.0, help="Answer item creation with 202 and an operation of this length")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--page-size", type=int, default=0, help="Page size of GET /workspaces and item listings")
+    args = parser.parse_args()
+    server = MockFabricServer(
+        port=args.port,
+        request_latency=args.request_latency_ms / 1000,
+        lro_duration=args.lro_seconds,
+        page_size=args.page_size,
+        throttle_rate=args.throttle_rate
+    )
+    logger.info(f"Mock Fabric API listening on {server.base_url}")
+    server.serve_forever()
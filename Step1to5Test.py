@@ -1,28 +1,22 @@
 import os
 import requests
-from azure.identity import ClientSecretCredential
-from dotenv import load_dotenv
 import shutil
 import subprocess
 import json
 import time
-import base64
-from azure.identity import DefaultAzureCredential
-from git import Repo
-from fabric_cicd import (
-    FabricWorkspace,
-    publish_all_items,
-    unpublish_all_orphan_items
+from FabricDeploymentManager import (
+    FABRIC_SCOPE, GRAPH_SCOPE, DeploymentScheduler, FabricHttpTransport, ItemDefinitionPackager,
+    LongRunningOperationPoller, PrincipalResolver, RepositoryFetcher, TokenProvider
 )
 
-load_dotenv()
-
-TENANT_ID = os.getenv("TENANT_ID")
-CLIENT_ID = os.getenv("CLIENT_ID")
-CLIENT_SECRET = os.getenv("CLIENT_SECRET")
-CAPACITY_ID = os.getenv("CAPACITY_ID")
-WORKSPACE_NAME = os.getenv("WORKSPACE_NAME")
-TARGET_ENVIRONMENT = os.getenv("TARGET_ENVIRONMENT")
+# Populated by load_settings() so importing this module has no side effects
+TENANT_ID = None
+CLIENT_ID = None
+CLIENT_SECRET = None
+CAPACITY_ID = None
+WORKSPACE_NAME = None
+TARGET_ENVIRONMENT = None
+DEPLOY_MAX_WORKERS = 8
 
 
 FABRIC_API = "https://api.fabric.microsoft.com/v1"
@@ -38,6 +32,10 @@ CLONE_DIR = "repo_clone"
 
 access_token = None
 workspace_id = None
+lro_poller = None
+token_provider = None
+principal_resolver = None
+packager = ItemDefinitionPackager()
 
 ITEM_TYPES_IN_SCOPE = [
     "Lakehouse",
@@ -66,7 +64,24 @@ user_email = "nazmulhasan.munna@datacrafters.io"
 # user_email = "nasif.azam@datacrafters.io"
 user_role = "Contributor"
 
+def load_settings():
+    """Load .env and read the service principal, workspace and concurrency settings"""
+    from dotenv import load_dotenv
+
+    global TENANT_ID, CLIENT_ID, CLIENT_SECRET, CAPACITY_ID, WORKSPACE_NAME, TARGET_ENVIRONMENT, DEPLOY_MAX_WORKERS
+    load_dotenv()
+    TENANT_ID = os.getenv("TENANT_ID")
+    CLIENT_ID = os.getenv("CLIENT_ID")
+    CLIENT_SECRET = os.getenv("CLIENT_SECRET")
+    CAPACITY_ID = os.getenv("CAPACITY_ID")
+    WORKSPACE_NAME = os.getenv("WORKSPACE_NAME")
+    TARGET_ENVIRONMENT = os.getenv("TARGET_ENVIRONMENT")
+    DEPLOY_MAX_WORKERS = int(os.getenv("DEPLOY_MAX_WORKERS", "8"))
+
+
 def get_credential():
+    from azure.identity import ClientSecretCredential, DefaultAzureCredential
+
     if CLIENT_SECRET:
         credential = ClientSecretCredential(
             tenant_id=TENANT_ID,
@@ -86,17 +101,21 @@ def get_credential():
 # )
 
 
+def get_token_provider():
+    """Return the shared token cache (one credential, tokens reused per scope)"""
+    global token_provider
+    if token_provider is None:
+        token_provider = TokenProvider.from_credential(
+            get_credential(),
+            cache_file=os.getenv("FABRIC_TOKEN_CACHE"),
+            cache_secret=CLIENT_SECRET
+        )
+    return token_provider
+
+
 def get_access_token():
     try:
-        credential = get_credential()
-        # credential = ClientSecretCredential(
-        #     tenant_id=TENANT_ID,
-        #     client_id=CLIENT_ID,
-        #     client_secret=CLIENT_SECRET
-        # )
-        token = credential.get_token(
-            "https://api.fabric.microsoft.com/.default"
-            ).token
+        token = get_token_provider().get_token(FABRIC_SCOPE)
         global access_token
         access_token = token
         print("[OK] Access token generated successfully")
@@ -110,11 +129,19 @@ def get_access_token():
 def get_headers():
     """Return authorization headers"""
     return {
-        "Authorization": f"Bearer {access_token}",
+        "Authorization": f"Bearer {get_token_provider().get_token(FABRIC_SCOPE)}",
         "Content-Type": "application/json"
     }
 
 
+def get_lro_poller():
+    """Return the shared poller for 202 Accepted operations"""
+    global lro_poller
+    if lro_poller is None:
+        lro_poller = LongRunningOperationPoller(FabricHttpTransport(), get_headers, operations_base=FABRIC_API)
+    return lro_poller
+
+
 def verify_service_principal_access():
     """Verify SP can access Fabric API"""
     try:
@@ -195,22 +222,14 @@ def get_workspace_users():
 
 def get_token(scope):
     try:
-        credential = ClientSecretCredential(
-            tenant_id=TENANT_ID,
-            client_id=CLIENT_ID,
-            client_secret=CLIENT_SECRET
-        )
-        token = credential.get_token(scope).token
-        print(f"[OK] Token generated for scope: {scope}")
-        print("Secondary token:", token)
-        return token
+        return get_token_provider().get_token(scope)
     except Exception as e:
         print(f"[ERROR] Token generation failed: {e}")
         raise
 
 
 def get_graph_headers():
-    token = get_token("https://graph.microsoft.com/.default")
+    token = get_token(GRAPH_SCOPE)
     return {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
@@ -218,26 +237,35 @@ def get_graph_headers():
 
 
 def get_fabric_headers():
-    token = get_token("https://api.fabric.microsoft.com/.default")
+    token = get_token(FABRIC_SCOPE)
     return {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
     }
 
 
+def get_principal_resolver():
+    """Return the shared Graph principal resolver (batched lookups, cached on disk)"""
+    global principal_resolver
+    if principal_resolver is None:
+        principal_resolver = PrincipalResolver(
+            FabricHttpTransport(),
+            get_graph_headers,
+            cache_file=os.getenv("FABRIC_PRINCIPAL_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "fabric-deploy", "principals.json")),
+            namespace=TENANT_ID
+        )
+    return principal_resolver
+
+
 def get_user_object_id():
-    url = f"https://graph.microsoft.com/v1.0/users/{user_email}"
-    user_response = requests.get(url, headers=get_graph_headers())
+    user_id = get_principal_resolver().resolve([user_email], "User")[user_email]
     
-    if user_response.status_code != 200:
-        print(f"Failed to find user: {user_response.status_code}")
-        print(user_response.text)
-        # exit()
+    if user_id is None:
+        print(f"Failed to find user: {user_email}")
         return None
     else:
-        print("User Object ID:", user_response.json()["id"])
-        user_response.raise_for_status()
-        return user_response.json()["id"]
+        print("User Object ID:", user_id)
+        return user_id
 
 
 def get_role_assignments():
@@ -260,10 +288,18 @@ def get_role_assignments():
 def assign_roles():
     headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
     existing = {(ra["principal"]["id"], ra["role"]) for ra in get_role_assignments()}
+    # Users may be listed by email/UPN; resolve them all up front in Graph batches
+    object_ids = get_principal_resolver().resolve(
+        [user for role in roles for user in role.get("users", [])], "User"
+    )
  
     for role in roles:
         role_name = role["role_name"]
-        for user_id in role.get("users", []):
+        for user in role.get("users", []):
+            user_id = object_ids.get(user)
+            if user_id is None:
+                print(f"[ERROR] User not found: {user}")
+                continue
             if (user_id, role_name) in existing:
                 print(f"[SKIP] {user_id} already assigned {role_name}")
                 continue
@@ -378,11 +414,14 @@ def assign_roles():
 # CLONE REPO (if not exists)
 # -----------------------------
 def clone_repo():
-    if not os.path.exists(CLONE_DIR):
-        Repo.clone_from(GITHUB_REPO, CLONE_DIR)
-        print("[OK] Repo cloned")
-    else:
-        print("[INFO] Repo already exists")
+    # Shallow, sparse checkout of the Development folder through the local mirror cache
+    stats = RepositoryFetcher().fetch(
+        GITHUB_REPO,
+        GITHUB_BRANCH,
+        CLONE_DIR,
+        sparse_paths=[f"{REPO_NAME}/Development"]
+    )
+    print(f"[OK] Repo fetched ({stats['bytes_transferred']} bytes in {stats['seconds']}s)")
 
 # -----------------------------
 # FIND DEVELOPMENT FOLDER
@@ -424,6 +463,8 @@ def get_development_path():
 
 
 def deploy():
+    from fabric_cicd import FabricWorkspace, publish_all_items, unpublish_all_orphan_items
+
     print(f"[INFO] Target workspace: {workspace_id}")
 
     repo_dir = r"C:\Users\NasifAzam\Documents\DC-GitHub\Nasif-Dev\Development"
@@ -473,6 +514,7 @@ def get_items_from_github(repo_url="https://github.com/Nasif-Azam/Nasif-Dev",
                 
                 if itype != "Unknown":
                     items.append({
+                        "fullName": item_name,
                         "displayName": item_name.split('.')[0],
                         "type": itype,
                         "path": item_path
@@ -486,59 +528,36 @@ def get_items_from_github(repo_url="https://github.com/Nasif-Azam/Nasif-Dev",
 
 # Step 8: Copy item to workspace
 def copy_item_to_workspace(item, target_workspace_id):
-    """Deploy item to workspace with Base64 encoding"""
+    """Deploy item to workspace with its full Base64-encoded definition"""
     try:
         item_type = item.get('type')
         item_name = item.get('displayName')
         item_path = item.get('path')
         
-        def_map = {
-            'Report': 'definition.pbir',
-            'SemanticModel': 'definition.pbism',
-            'Lakehouse': 'lakehouse.metadata.json',
-            'Dataflow': 'mashup.pq',
-            'Notebook': 'notebook-content.py'
-        }
-        
-        logical_file = def_map.get(item_type)
-        if not logical_file:
-            print(f"[SKIP] Unknown definition for {item_type}")
+        # Package every definition file of the item folder
+        definition, stats = packager.package(item_path)
+        if not definition["parts"]:
+            print(f"[WARNING] No definition files found in {item_path}")
             return False
-        
-        file_path = os.path.join(item_path, logical_file)
-        
-        if item_type == 'Notebook' and not os.path.exists(file_path):
-            file_path = os.path.join(item_path, f"{item_name}.ipynb")
-            logical_file = f"{item_name}.ipynb"
-        
-        if not os.path.exists(file_path):
-            print(f"[WARNING] File not found: {file_path}")
-            return False
-        
-        # Read and Base64 encode
-        with open(file_path, 'rb') as f:
-            raw_content = f.read()
-            base64_content = base64.b64encode(raw_content).decode('utf-8')
+        print(f"[INFO] Packaged {item_name}: {stats['parts']} parts, {stats['raw_bytes']} bytes -> "
+              f"{stats['payload_bytes']} bytes base64 in {stats['encode_seconds']}s")
         
         # Create payload
         payload = {
             "displayName": item_name,
             "type": item_type,
-            "definition": {
-                "parts": [
-                    {
-                        "path": logical_file,
-                        "payload": base64_content,
-                        "payloadType": "InlineBase64"
-                    }
-                ]
-            }
+            "definition": definition
         }
         
         url = f"{FABRIC_API}/workspaces/{target_workspace_id}/items"
         response = requests.post(url, headers=get_headers(), json=payload)
         
-        if response.status_code in [200, 201, 202]:
+        if response.status_code == 202:
+            # Item is still provisioning; poll the operation until it finishes
+            get_lro_poller().wait(response, item_name)
+            print(f"[OK] Created {item_name}")
+            return True
+        elif response.status_code in [200, 201]:
             print(f"[OK] Created {item_name}")
             return True
         else:
@@ -554,7 +573,7 @@ def copy_item_to_workspace(item, target_workspace_id):
 
 
 def main():
-    
+    load_settings()
     print("\n########## Microsoft Fabric Deployment ##########")
     
     # Step 1: Get token
@@ -604,11 +623,18 @@ def main():
     
     # Step 6: Deploy items
     print("\n--- Deploying Items ---")
-    success_count = 0
-    for item in items:
-        if copy_item_to_workspace(item, workspace_id):
-            success_count += 1
-        time.sleep(2)
+    # Models and lakehouses are deployed before the reports and dataflows bound to them;
+    # items whose dependency failed are not deployed
+    def deploy_item(item):
+        ok = copy_item_to_workspace(item, workspace_id)
+        return {"name": item["displayName"], "fullName": item["fullName"], "type": item["type"],
+                "status": "deployed" if ok else "failed"}
+    
+    results = DeploymentScheduler(items).run(deploy_item, max_workers=DEPLOY_MAX_WORKERS)
+    for entry in results:
+        if entry.get("error"):
+            print(f"[SKIP] {entry['fullName']}: {entry['error']}")
+    success_count = sum(1 for entry in results if entry["status"] == "deployed")
     
     # Step 7: Cleanup
     if os.path.exists("temp_fabric_repo"):
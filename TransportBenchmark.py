@@ -0,0 +1,106 @@
+import sys
+import json
+import time
+import logging
+import argparse
+import statistics
+from typing import Dict, List
+
+from FabricDeploymentManager import FabricDeploymentManager, FabricHttpTransport
+from MockFabricServer import MockFabricServer
+
+logger = logging.getLogger(__name__)
+
+
+class TimedTransport(FabricHttpTransport):
+    """
+    Transport that records the latency of every call it sends.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.latencies: List[float] = []
+
+    def request(self, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().request(method, url, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def run_deploy(server: MockFabricServer, pooled: bool, item_count: int) -> Dict:
+    """
+    Deploy item_count items between two mock workspaces and measure per-call latency.
+
+    Args:
+        server: Running mock Fabric server
+        pooled: Whether to use the pooled keep-alive transport
+        item_count: Number of items to deploy
+
+    Returns:
+        Dict: Latency statistics for the run
+    """
+    source = server.state.add_workspace("Bench-Dev")
+    target = server.state.add_workspace("Bench-Prod")
+    for i in range(item_count):
+        server.state.add_item(source["id"], f"Item {i}", "Report")
+
+    transport = TimedTransport(pooled=pooled)
+    manager = FabricDeploymentManager(
+        tenant_id="bench-tenant",
+        client_id="bench-client",
+        client_secret="bench-secret",
+        capacity_id="bench-capacity",
+        transport=transport,
+        fabric_api_base=f"{server.base_url}/v1",
+        authority_host=server.base_url
+    )
+
+    connections_before = server.state.connection_count
+    start = time.perf_counter()
+    summary = manager.deploy_items(source["id"], target["id"])
+    wall_time = time.perf_counter() - start
+    manager.close()
+
+    latencies_ms = sorted(latency * 1000 for latency in transport.latencies)
+    return {
+        "mode": "pooled" if pooled else "unpooled",
+        "items": item_count,
+        "deployed": summary["success"],
+        "requests": len(latencies_ms),
+        "connections": server.state.connection_count - connections_before,
+        "wall_time_s": round(wall_time, 3),
+        "mean_ms": round(statistics.mean(latencies_ms), 3),
+        "p50_ms": round(latencies_ms[len(latencies_ms) // 2], 3),
+        "p95_ms": round(latencies_ms[int(len(latencies_ms) * 0.95) - 1], 3)
+    }
+
+
+def main():
+    """
+    Compare per-call latency of unpooled vs pooled transports on a mock 500-item deploy.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Fabric HTTP transport against a local mock server")
+    parser.add_argument("--items", type=int, default=500, help="Number of items to deploy")
+    parser.add_argument("--handshake-ms", type=float, default=20.0,
+                        help="Simulated connection setup cost (TCP+TLS) per new connection")
+    args = parser.parse_args()
+
+    logging.getLogger("FabricDeploymentManager").setLevel(logging.WARNING)
+
+    server = MockFabricServer(handshake_latency=args.handshake_ms / 1000).start()
+    try:
+        results = [
+            run_deploy(server, pooled=False, item_count=args.items),
+            run_deploy(server, pooled=True, item_count=args.items)
+        ]
+    finally:
+        server.stop()
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FabricDeploymentManager import DefinitionBlobCache, FabricDeploymentManager, FabricHttpTransport, RetryPolicy
+from MockFabricServer import MockFabricServer
+
+
+@pytest.fixture
+def server():
+    """Mock Fabric API on a free local port."""
+    server = MockFabricServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def make_manager(server, tmp_path):
+    """Build managers pointed at the mock server, with fast retries and caches under tmp_path."""
+    managers = []
+
+    def make(**kwargs) -> FabricDeploymentManager:
+        retry_policy = kwargs.pop("retry_policy", None) or RetryPolicy(backoff_base=0.01, backoff_max=0.05)
+        manager = FabricDeploymentManager(
+            tenant_id="test-tenant",
+            client_id="test-client",
+            client_secret="test-secret",
+            capacity_id="test-capacity",
+            transport=FabricHttpTransport(retry_policy=retry_policy),
+            fabric_api_base=f"{server.base_url}/v1",
+            authority_host=server.base_url,
+            repo_cache_dir=str(tmp_path / "mirrors"),
+            blob_cache=kwargs.pop("blob_cache", None) or DefinitionBlobCache(str(tmp_path / "blobs")),
+            **kwargs
+        )
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.close()
+
+
+@pytest.fixture
+def manager(make_manager):
+    return make_manager()
+
+
+@pytest.fixture
+def make_item(tmp_path):
+    """Write an item folder (<folder>/<files>, optional .platform displayName) under tmp_path/Development."""
+    dev_path = tmp_path / "Development"
+
+    def make(folder: str, files: dict, display_name: str = None) -> str:
+        item_path = dev_path / folder
+        for relative_path, content in files.items():
+            file_path = item_path / relative_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                file_path.write_bytes(content)
+            else:
+                file_path.write_text(content, encoding="utf-8")
+        if display_name is not None:
+            item_type = folder.rsplit(".", 1)[-1]
+            (item_path / ".platform").write_text(
+                json.dumps({"metadata": {"type": item_type, "displayName": display_name}}), encoding="utf-8")
+        return str(item_path)
+
+    make.dev_path = str(dev_path)
+    return make
@@ -0,0 +1,101 @@
+"""AsyncFabricDeploymentManager against the mock server."""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from AsyncFabricDeploymentManager import AsyncFabricDeploymentManager, AsyncFabricHttpTransport
+from FabricDeploymentManager import CONTENT_HASH_MARKER, RetryPolicy
+
+
+def _run(server, scenario, **kwargs):
+    """Run scenario(manager) with an async manager pointed at the mock server."""
+    async def main():
+        transport = AsyncFabricHttpTransport(retry_policy=RetryPolicy(backoff_base=0.01, backoff_max=0.05))
+        async with AsyncFabricDeploymentManager("test-tenant", "test-client", "test-secret", "test-capacity",
+                                                transport=transport,
+                                                fabric_api_base=f"{server.base_url}/v1",
+                                                authority_host=server.base_url,
+                                                lro_initial_interval=0.05,
+                                                **kwargs) as manager:
+            return await scenario(manager)
+
+    return asyncio.run(main())
+
+
+def _item(make_item, full_name, files):
+    name, item_type = full_name.rsplit(".", 1)
+    return {"displayName": name, "fullName": full_name, "type": item_type, "path": make_item(full_name, files)}
+
+
+def test_dependents_of_a_failed_create_are_not_deployed(server, make_item):
+    workspace = server.state.add_workspace("Prod")
+    items = [
+        _item(make_item, "Sales.SemanticModel", {"definition/expressions.tmdl":
+                                                 'expression Source = Sql.Database("server", "Lake")'}),
+        _item(make_item, "Lake.Lakehouse", {"lakehouse.metadata.json": "{}"}),
+    ]
+    # The Lakehouse is created first; its create is rejected
+    server.inject_fault("POST", rf"/v1/workspaces/{workspace['id']}/items", 403)
+
+    summary = _run(server, lambda manager: manager.deploy_repository_items(items, workspace["id"]))
+
+    assert summary["failed"] == 2 and summary["success"] == 0
+    assert summary["items"][0]["error"] == "Dependency failed: Lake.Lakehouse"
+    assert server.state.items[workspace["id"]] == []
+
+
+def test_existing_item_is_updated_from_its_package(server, make_item):
+    workspace = server.state.add_workspace("Prod")
+    existing = server.state.add_item(workspace["id"], "Sales", "Notebook")
+    item = _item(make_item, "Sales.Notebook", {"notebook-content.py": "print('v2')"})
+    packaged = []
+
+    def package(entry):
+        packaged.append(entry["fullName"])
+        return {"parts": [{"path": "notebook-content.py", "payload": "cHJpbnQoJ3YyJyk=",
+                           "payloadType": "InlineBase64"}]}, {}
+
+    item.update({"package": package, "contentHash": "a" * 64})
+
+    summary = _run(server, lambda manager: manager.deploy_repository_items([item], workspace["id"]))
+
+    assert summary["success"] == 1 and summary["items"][0]["action"] == "updated"
+    assert packaged == ["Sales.Notebook"]
+    assert len(server.state.items[workspace["id"]]) == 1
+    assert existing["definitionUpdates"] == 1
+    assert CONTENT_HASH_MARKER.search(existing["description"]).group(1) == "a" * 64
+
+
+def test_retries_are_credited_to_the_workspace(server):
+    workspace = server.state.add_workspace("Prod")
+    server.inject_fault("GET", rf"/v1/workspaces/{workspace['id']}/items", 429, times=2, retry_after=0)
+
+    async def scenario(manager):
+        items = await manager.get_workspace_items(workspace["id"])
+        return items, manager.transport.retry_policy.snapshot()
+
+    items, retries = _run(server, scenario)
+
+    assert items == []
+    assert retries["retries_by_workspace"][workspace["id"]]["retries"] == 2
+
+
+def test_role_changes_are_rate_limited(server):
+    workspace = server.state.add_workspace("Prod")
+    desired = [{"principal": f"user-{i}", "type": "User", "role": "Viewer"} for i in range(3)]
+
+    async def scenario(manager):
+        start = time.monotonic()
+        report = await manager.reconcile_role_assignments(workspace["id"], desired)
+        return report, time.monotonic() - start
+
+    report, seconds = _run(server, scenario, role_requests_per_second=10)
+
+    assert [change["principal"] for change in report["added"]] == ["user-0", "user-1", "user-2"]
+    assert not report["failed"]
+    # Three changes at 10/s: the third starts at least 0.2s after the first
+    assert seconds >= 0.2
@@ -0,0 +1,91 @@
+"""DefinitionBlobCache reuse of encoded payloads within and across runs."""
+
+import base64
+import shutil
+
+import pytest
+
+from FabricDeploymentManager import DefinitionBlobCache, ItemDefinitionPackager
+
+THEME = '{"name": "Corporate"}' * 100
+
+
+@pytest.fixture
+def package(tmp_path):
+    """Package item folders with a fresh packager (a new run) over the blob cache in tmp_path/blobs."""
+    packagers = []
+
+    def package(item_path, cache_dir=str(tmp_path / "blobs"), **kwargs):
+        packager = ItemDefinitionPackager(blob_cache=DefinitionBlobCache(cache_dir, **kwargs))
+        packagers.append(packager)
+        definition, _ = packager.package(item_path)
+        packager.blob_cache.save()
+        return definition, packager.blob_cache.snapshot()
+
+    yield package
+    for packager in packagers:
+        packager.close()
+
+
+def _payloads(definition):
+    return {part["path"]: base64.b64decode(part["payload"]).decode("utf-8") for part in definition["parts"]}
+
+
+def test_identical_files_are_encoded_once(make_item, tmp_path):
+    cache = DefinitionBlobCache(str(tmp_path / "blobs"))
+    packager = ItemDefinitionPackager(blob_cache=cache)
+    try:
+        for name in ("Sales", "Finance"):
+            packager.package(make_item(f"{name}.Report", {"StaticResources/theme.json": THEME,
+                                                          "report.json": f'{{"name": "{name}"}}'}))
+    finally:
+        packager.close()
+
+    stats = cache.snapshot()
+    assert stats["misses"] == 3 and stats["hits"] == 1
+    assert stats["reused_bytes"] == len(base64.b64encode(THEME.encode("utf-8")))
+
+
+def test_unchanged_checkout_is_served_from_the_stat_index(make_item, package):
+    item_path = make_item("Sales.Report", {"report.json": '{"name": "Sales"}', "theme.json": THEME})
+
+    first, first_stats = package(item_path)
+    second, second_stats = package(item_path)
+
+    assert first_stats["misses"] == 2
+    assert second_stats["misses"] == 0 and second_stats["disk_hits"] == 2
+    assert _payloads(second) == _payloads(first)
+
+
+def test_fresh_checkout_is_looked_up_by_digest(make_item, package, tmp_path):
+    item_path = make_item("Sales.Report", {"report.json": '{"name": "Sales"}', "theme.json": THEME})
+    package(item_path)
+    # A new clone has the same content at new paths and mtimes, so the stat index misses
+    checkout = shutil.copytree(item_path, str(tmp_path / "checkout" / "Sales.Report"))
+
+    definition, stats = package(checkout)
+
+    assert stats["misses"] == 0 and stats["disk_hits"] == 2
+    assert _payloads(definition) == {"report.json": '{"name": "Sales"}', "theme.json": THEME}
+
+
+def test_changed_file_is_encoded_again(make_item, package, tmp_path):
+    item_path = make_item("Sales.Report", {"report.json": '{"name": "Sales"}', "theme.json": THEME})
+    package(item_path)
+    with open(f"{item_path}/report.json", "w", encoding="utf-8") as f:
+        f.write('{"name": "Sales v2"}')
+
+    definition, stats = package(item_path)
+
+    assert stats["misses"] == 1 and stats["disk_hits"] == 1
+    assert _payloads(definition)["report.json"] == '{"name": "Sales v2"}'
+
+
+def test_memory_only_cache_persists_nothing(make_item, package, tmp_path):
+    item_path = make_item("Sales.Report", {"theme.json": THEME})
+
+    package(item_path, cache_dir=str(tmp_path / "memory"), max_disk_bytes=0)
+    _, stats = package(item_path, cache_dir=str(tmp_path / "memory"), max_disk_bytes=0)
+
+    assert stats["misses"] == 1
+    assert not (tmp_path / "memory").exists()
@@ -0,0 +1,32 @@
+"""FabricDeploy.py argument handling."""
+
+import pytest
+
+from FabricDeploy import apply_overrides, build_parser, main
+from FabricDeploymentManager import load_config_from_env
+
+
+@pytest.mark.parametrize("option", ["--incremental", "--resume", "--prune", "--targets-file=targets.json"])
+def test_source_workspace_rejects_repository_options(option, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["items", "deploy", "--source-workspace-id", "source", option])
+
+    assert exit_info.value.code == 2
+    assert option.split("=")[0] in capsys.readouterr().err
+
+
+def test_overrides_keep_falsy_values_and_skip_missing_ones(monkeypatch):
+    for name in ("TENANT_ID_ENV", "CLIENT_ID_ENV", "CLIENT_SECRET_ENV", "CAPACITY_ID_ENV"):
+        monkeypatch.setenv(name, "test")
+    monkeypatch.delenv("FABRIC_POOL_MAXSIZE", raising=False)
+    monkeypatch.setenv("DEPLOY_MAX_WORKERS", "8")
+    monkeypatch.setenv("GITHUB_BRANCH", "Dev-Branch")
+    args = build_parser().parse_args(["items", "deploy", "--max-workers", "0", "--branch", "",
+                                      "--max-deletions", "0"])
+
+    config = apply_overrides(load_config_from_env(), args)
+
+    assert config["max_workers"] == 0
+    assert config["branch"] == ""
+    assert config["max_deletions"] == 0
+    assert config["pool_maxsize"] == 32
@@ -0,0 +1,37 @@
+"""Content hashes recorded by both deployment paths."""
+
+import pytest
+
+from FabricDeploymentManager import CONTENT_HASH_MARKER, compute_item_hash
+
+
+@pytest.fixture
+def repository(manager, make_item, monkeypatch):
+    path = make_item("Sales.Notebook", {"notebook-content.py": "print('sales')"})
+    monkeypatch.setattr(manager, "get_items_from_github",
+                        lambda **kwargs: manager.get_items_from_path(make_item.dev_path))
+    return compute_item_hash(path)
+
+
+def _recorded_hash(server, workspace_id):
+    item, = server.state.items[workspace_id]
+    return CONTENT_HASH_MARKER.search(item["description"]).group(1)
+
+
+def test_single_workspace_deploy_records_the_hash(server, manager, repository):
+    workspace = server.state.add_workspace("Prod")
+
+    summary = manager.deploy_items_from_github(target_workspace_id=workspace["id"], state_file=None)
+
+    assert summary["success"] == 1
+    assert _recorded_hash(server, workspace["id"]) == repository
+
+
+def test_fan_out_records_the_hash_in_every_workspace(server, manager, repository):
+    workspaces = [server.state.add_workspace(name) for name in ("Prod A", "Prod B")]
+
+    summary = manager.deploy_to_workspaces([{"name": ws["displayName"], "id": ws["id"]} for ws in workspaces],
+                                           state_file=None)
+
+    assert summary["success"] == 2
+    assert [_recorded_hash(server, ws["id"]) for ws in workspaces] == [repository, repository]
@@ -0,0 +1,69 @@
+"""DeploymentJournal replay and resuming interrupted runs."""
+
+import json
+
+from FabricDeploymentManager import DeploymentJournal
+
+
+def test_load_keeps_latest_state_and_skips_torn_lines(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = DeploymentJournal(path)
+    journal.record("ws", "Sales.Notebook", "submitted")
+    journal.record("ws", "Sales.Notebook", "done", id="item-1")
+    journal.record("ws", "Finance.Notebook", "pending", operation="http://op")
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"workspace": "ws", "item": "Fin')
+
+    entries = DeploymentJournal(path).load()
+
+    assert entries[("ws", "Sales.Notebook")]["state"] == "done"
+    assert entries[("ws", "Sales.Notebook")]["id"] == "item-1"
+    assert entries[("ws", "Finance.Notebook")]["operation"] == "http://op"
+
+
+def test_resume_matches_items_whose_display_name_differs_from_the_folder(server, manager, make_item, tmp_path,
+                                                                         monkeypatch):
+    workspace = server.state.add_workspace("Prod")
+    make_item("sales_nb.Notebook", {"notebook-content.py": "print('sales')"}, display_name="Sales Notebook")
+    make_item("Finance.Notebook", {"notebook-content.py": "print('finance')"})
+    monkeypatch.setattr(manager, "get_items_from_github",
+                        lambda **kwargs: manager.get_items_from_path(make_item.dev_path))
+    journal_file = str(tmp_path / "journal.jsonl")
+
+    first = manager.deploy_items_from_github(target_workspace_id=workspace["id"], state_file=None,
+                                             journal_file=journal_file)
+    assert first["success"] == 2
+
+    with open(journal_file, encoding="utf-8") as f:
+        keys = {json.loads(line)["item"] for line in f}
+    assert keys == {"sales_nb.Notebook", "Finance.Notebook"}
+
+    requests_before = len(server.state.request_log)
+    resumed = manager.deploy_items_from_github(target_workspace_id=workspace["id"], state_file=None,
+                                               journal_file=journal_file, resume=True)
+
+    assert resumed["resumed"] == 2
+    assert {entry["fullName"]: entry["status"] for entry in resumed["items"]} == {
+        "sales_nb.Notebook": "resumed", "Finance.Notebook": "resumed"}
+    assert not any(entry.startswith("POST") for entry in server.state.request_log[requests_before:])
+
+
+def test_resume_settles_a_submitted_create_by_listing(server, manager, make_item, tmp_path, monkeypatch):
+    workspace = server.state.add_workspace("Prod")
+    make_item("sales_nb.Notebook", {"notebook-content.py": "print('sales')"}, display_name="Sales Notebook")
+    monkeypatch.setattr(manager, "get_items_from_github",
+                        lambda **kwargs: manager.get_items_from_path(make_item.dev_path))
+    # The interrupted run sent the create, which was applied, but never recorded the outcome
+    created = server.state.add_item(workspace["id"], "Sales Notebook", "Notebook")
+    journal_file = str(tmp_path / "journal.jsonl")
+    journal = DeploymentJournal(journal_file)
+    journal.record(workspace["id"], "sales_nb.Notebook", "submitted")
+    journal.close()
+
+    summary = manager.deploy_items_from_github(target_workspace_id=workspace["id"], state_file=None,
+                                               journal_file=journal_file, resume=True)
+
+    assert summary["resumed"] == 1
+    assert summary["items"][0]["id"] == created["id"]
+    assert len(server.state.items[workspace["id"]]) == 1
@@ -0,0 +1,53 @@
+"""LongRunningOperationPoller against mock operations."""
+
+import time
+
+import pytest
+
+from FabricDeploymentManager import (FabricHttpTransport, LongRunningOperationError, LongRunningOperationPoller,
+                                     RetryPolicy)
+
+
+@pytest.fixture
+def poller(server):
+    transport = FabricHttpTransport(retry_policy=RetryPolicy(backoff_base=0.01, backoff_max=0.05))
+    poller = LongRunningOperationPoller(transport, dict, operations_base=f"{server.base_url}/v1",
+                                        initial_interval=0.05, max_interval=0.1)
+    yield poller
+    poller.close()
+    transport.close()
+
+
+def test_operation_result_is_returned(server, poller):
+    operation = server.state.add_operation({"id": "item-1"}, duration=0.1)
+
+    future = poller.track(f"{server.base_url}/v1/operations/{operation['id']}", "item", workspace_id="ws")
+
+    assert future.result(timeout=5) == {"id": "item-1"}
+    assert poller.operations[0]["workspaceId"] == "ws" and poller.operations[0]["status"] == "Succeeded"
+
+
+def test_retried_status_request_does_not_hold_up_other_operations(server, poller):
+    slow = server.state.add_operation({"id": "slow"}, duration=0)
+    fast = server.state.add_operation({"id": "fast"}, duration=0)
+    # The slow operation's status request is throttled twice and retried after Retry-After
+    server.inject_fault("GET", f"/v1/operations/{slow['id']}", 429, times=2, retry_after=0.5)
+
+    start = time.monotonic()
+    slow_future = poller.track(f"{server.base_url}/v1/operations/{slow['id']}", "slow", first_delay=0)
+    fast_future = poller.track(f"{server.base_url}/v1/operations/{fast['id']}", "fast", first_delay=0.01)
+
+    assert fast_future.result(timeout=5) == {"id": "fast"}
+    fast_seconds = time.monotonic() - start
+    assert slow_future.result(timeout=5) == {"id": "slow"}
+    assert fast_seconds < 0.5 < time.monotonic() - start
+
+
+def test_close_fails_pending_operations(server, poller):
+    operation = server.state.add_operation({"id": "item-1"}, duration=60)
+
+    future = poller.track(f"{server.base_url}/v1/operations/{operation['id']}", "item", first_delay=30)
+    poller.close()
+
+    with pytest.raises(LongRunningOperationError):
+        future.result(timeout=5)
@@ -0,0 +1,25 @@
+"""plan_deployment against a paged item listing."""
+
+
+def test_plan_sees_items_on_every_page(server, manager, make_item, tmp_path):
+    server.page_size = 2
+    workspace = server.state.add_workspace("Prod")
+    for i in range(4):
+        server.state.add_item(workspace["id"], f"Old {i}", "Notebook")
+    sales = server.state.add_item(workspace["id"], "Sales", "Notebook")
+    make_item("Sales.Notebook", {"notebook-content.py": "print('sales')"})
+    make_item("Finance.Notebook", {"notebook-content.py": "print('finance')"})
+    state_file = str(tmp_path / "state.json")
+
+    plan = manager.plan_deployment(workspace["id"], dev_path=make_item.dev_path, state_file=state_file)
+
+    assert [entry["name"] for entry in plan["create"]] == ["Finance"]
+    assert [entry["name"] for entry in plan["update"]] == ["Sales"]
+    assert sorted(entry["name"] for entry in plan["orphan"]) == [f"Old {i}" for i in range(4)]
+
+    # Once the deployed description records the same hash, the item is unchanged
+    sales["description"] = f"Deployed from GitHub repository - Notebook [content-sha256:{plan['update'][0]['contentHash']}]"
+    plan = manager.plan_deployment(workspace["id"], dev_path=make_item.dev_path, state_file=state_file)
+
+    assert [entry["name"] for entry in plan["unchanged"]] == ["Sales"]
+    assert plan["summary"] == {"create": 1, "update": 0, "unchanged": 1, "orphan": 4}
@@ -0,0 +1,97 @@
+"""prune_orphans guards and deletion waves against paged item listings."""
+
+from FabricDeploymentManager import deletion_waves, find_orphan_items
+
+
+def _repo_item(name, item_type, full_name=None):
+    return {"displayName": name, "type": item_type, "fullName": full_name or f"{name}.{item_type}"}
+
+
+def _names(server, workspace_id):
+    return sorted(item["displayName"] for item in server.state.items[workspace_id])
+
+
+def test_orphans_on_later_pages_are_found(server, manager):
+    server.page_size = 2
+    workspace = server.state.add_workspace("Prod")
+    for i in range(5):
+        server.state.add_item(workspace["id"], f"Notebook {i}", "Notebook")
+    server.state.add_item(workspace["id"], "Unmanaged", "Lakehouse")
+
+    repo_items = [_repo_item(f"Notebook {i}", "Notebook") for i in range(3)]
+    report = manager.prune_orphans(workspace["id"], repo_items)
+
+    assert sorted(entry["name"] for entry in report["deleted"]) == ["Notebook 3", "Notebook 4"]
+    # Types the repository does not manage are out of scope
+    assert _names(server, workspace["id"]) == ["Notebook 0", "Notebook 1", "Notebook 2", "Unmanaged"]
+
+
+def test_empty_repository_never_prunes(server, manager):
+    workspace = server.state.add_workspace("Prod")
+    server.state.add_item(workspace["id"], "Sales", "Notebook")
+
+    assert manager.prune_orphans(workspace["id"], []) is None
+    assert _names(server, workspace["id"]) == ["Sales"]
+
+
+def test_deletion_limit_blocks_everything(server, manager):
+    workspace = server.state.add_workspace("Prod")
+    for i in range(3):
+        server.state.add_item(workspace["id"], f"Old {i}", "Notebook")
+
+    report = manager.prune_orphans(workspace["id"], [_repo_item("Sales", "Notebook")], max_deletions=2)
+
+    assert report["blocked"] and not report["deleted"]
+    assert len(_names(server, workspace["id"])) == 3
+
+
+def test_unmatched_folder_names_block_pruning(server, manager):
+    workspace = server.state.add_workspace("Prod")
+    server.state.add_item(workspace["id"], "Sales Report", "Report")
+    server.state.add_item(workspace["id"], "Old", "Report")
+
+    # The folder name does not map back to the displayName, so "Sales Report" could look orphaned
+    repo_items = [_repo_item("Sales", "Report", full_name="Sales Report.Report")]
+    report = manager.prune_orphans(workspace["id"], repo_items)
+
+    assert report["blocked"] and report["unmatched"] == ["Sales Report.Report"]
+    assert _names(server, workspace["id"]) == ["Old", "Sales Report"]
+
+
+def test_dry_run_only_reports(server, manager):
+    workspace = server.state.add_workspace("Prod")
+    server.state.add_item(workspace["id"], "Old", "Notebook")
+
+    report = manager.prune_orphans(workspace["id"], [_repo_item("Sales", "Notebook")], dry_run=True)
+
+    assert [entry["name"] for entry in report["orphans"]] == ["Old"]
+    assert _names(server, workspace["id"]) == ["Old"]
+
+
+def test_failed_wave_skips_later_waves(server, manager):
+    workspace = server.state.add_workspace("Prod")
+    report_item = server.state.add_item(workspace["id"], "Old Report", "Report")
+    server.state.add_item(workspace["id"], "Old Model", "SemanticModel")
+    server.state.add_item(workspace["id"], "Old Lakehouse", "Lakehouse")
+    server.inject_fault("DELETE", rf"/v1/workspaces/{workspace['id']}/items/{report_item['id']}", 403)
+
+    repo_items = [_repo_item("Sales", "Report"), _repo_item("Sales", "SemanticModel"),
+                  _repo_item("Sales", "Lakehouse")]
+    report = manager.prune_orphans(workspace["id"], repo_items)
+
+    assert [entry["name"] for entry in report["failed"]] == ["Old Report"]
+    assert sorted(entry["name"] for entry in report["skipped"]) == ["Old Lakehouse", "Old Model"]
+    assert _names(server, workspace["id"]) == ["Old Lakehouse", "Old Model", "Old Report"]
+
+
+def test_deletion_waves_put_dependents_first():
+    items = [{"type": "Lakehouse"}, {"type": "Notebook"}, {"type": "Report"}, {"type": "SemanticModel"}]
+
+    assert [[item["type"] for item in wave] for wave in deletion_waves(items)] == [
+        ["Report"], ["SemanticModel"], ["Notebook"], ["Lakehouse"]]
+
+
+def test_find_orphan_items_respects_item_types():
+    workspace_items = [{"type": "Notebook", "displayName": "Old"}, {"type": "Report", "displayName": "Old"}]
+
+    assert find_orphan_items([], workspace_items, ["Report"]) == [{"type": "Report", "displayName": "Old"}]
@@ -0,0 +1,27 @@
+"""Readiness probes and the time-saved report."""
+
+
+def test_replaced_sleep_is_credited_once_per_site(server, manager):
+    assert manager.create_workspace("Prod A")
+    assert manager.create_workspace("Prod B")
+
+    summary = manager.readiness_summary()
+
+    assert summary["probes"] == 2
+    assert summary["replaced_sleep_seconds"] == 2.0
+    assert summary["saved_seconds"] <= 2.0
+
+
+def test_probes_without_a_replaced_sleep_save_nothing(manager):
+    attempts = []
+
+    def probe():
+        attempts.append(1)
+        return len(attempts) == 2
+
+    assert manager.wait_until_ready(probe, "item", initial_interval=0.01)
+    assert not manager.wait_until_ready(lambda: False, "never", timeout=0.05, initial_interval=0.01)
+
+    summary = manager.readiness_summary()
+    assert summary["replaced_sleep_seconds"] == 0 and summary["saved_seconds"] == 0
+    assert summary["waited_seconds"] > 0
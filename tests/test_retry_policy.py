@@ -0,0 +1,104 @@
+import email.utils
+import time
+
+import pytest
+import requests
+
+from FabricDeploymentManager import FabricHttpTransport, RetryPolicy
+
+
+def response_with(headers: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 429
+    response.headers.update(headers)
+    return response
+
+
+def test_backoff_is_full_jitter_bounded_by_max():
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+    for attempt in range(6):
+        delays = [policy.get_delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= min(5.0, 2 ** attempt) for delay in delays)
+    # Jittered, not a fixed schedule
+    assert len({round(policy.get_delay(3), 6) for _ in range(20)}) > 1
+
+
+def test_retry_after_seconds_is_honored_and_capped():
+    policy = RetryPolicy(max_retry_after=10.0)
+    assert 3.0 <= policy.get_delay(0, response_with({"Retry-After": "3"})) <= 3.25
+    assert 10.0 <= policy.get_delay(0, response_with({"Retry-After": "600"})) <= 10.25
+
+
+def test_retry_after_http_date():
+    policy = RetryPolicy()
+    value = email.utils.formatdate(time.time() + 5, usegmt=True)
+    assert 3.0 <= policy.get_delay(0, response_with({"Retry-After": value})) <= 5.25
+
+
+@pytest.mark.parametrize("method,idempotent", [
+    ("GET", True), ("PUT", True), ("DELETE", True), ("POST", False), ("PATCH", False)
+])
+def test_idempotent_methods(method, idempotent):
+    assert RetryPolicy().is_idempotent(method) is idempotent
+
+
+def test_endpoint_budget():
+    policy = RetryPolicy(endpoint_budget=2, endpoint_budgets={"POST /v1/workspaces": 1})
+    assert policy.take_budget("GET /v1/workspaces")
+    assert policy.take_budget("GET /v1/workspaces")
+    assert not policy.take_budget("GET /v1/workspaces")
+    assert policy.take_budget("POST /v1/workspaces")
+    assert not policy.take_budget("POST /v1/workspaces")
+
+
+@pytest.fixture
+def transport():
+    transport = FabricHttpTransport(retry_policy=RetryPolicy(backoff_base=0.01, backoff_max=0.05))
+    yield transport
+    transport.close()
+
+
+def test_throttled_post_is_retried(server, transport):
+    server.inject_fault("POST", "/v1/workspaces", 429, times=2, retry_after=0)
+    response = transport.post(f"{server.base_url}/v1/workspaces", json={"displayName": "Retried"})
+    assert response.status_code == 201
+    assert server.state.request_log.count("POST /v1/workspaces") == 3
+    assert transport.retry_policy.retries == 2
+
+
+def test_transient_get_is_retried(server, transport):
+    server.inject_fault("GET", "/v1/workspaces", 503)
+    assert transport.get(f"{server.base_url}/v1/workspaces").status_code == 200
+    assert server.state.request_log.count("GET /v1/workspaces") == 2
+
+
+def test_transient_post_is_not_replayed_without_guard(server, transport):
+    server.inject_fault("POST", "/v1/workspaces", 503)
+    response = transport.post(f"{server.base_url}/v1/workspaces", json={"displayName": "Once"})
+    assert response.status_code == 503
+    assert server.state.request_log.count("POST /v1/workspaces") == 1
+
+
+def test_transient_post_replayed_when_guard_finds_nothing(server, transport):
+    server.inject_fault("POST", "/v1/workspaces", 503)
+    response = transport.post(f"{server.base_url}/v1/workspaces", json={"displayName": "Guarded"},
+                              already_applied=lambda: None)
+    assert response.status_code == 201
+    assert server.state.request_log.count("POST /v1/workspaces") == 2
+
+
+def test_transient_post_recovered_when_guard_finds_resource(server, transport):
+    server.inject_fault("POST", "/v1/workspaces", 503)
+    existing = {"id": "already-there", "displayName": "Applied"}
+    response = transport.post(f"{server.base_url}/v1/workspaces", json={"displayName": "Applied"},
+                              already_applied=lambda: existing)
+    assert response.status_code == 200
+    assert response.json() == existing
+    assert server.state.request_log.count("POST /v1/workspaces") == 1
+
+
+def test_retries_counted_per_workspace(server, transport):
+    workspace = server.state.add_workspace("Counted")
+    server.inject_fault("GET", f"/v1/workspaces/{workspace['id']}/items", 429, retry_after=0)
+    transport.get(f"{server.base_url}/v1/workspaces/{workspace['id']}/items")
+    assert transport.retry_policy.snapshot()["retries_by_workspace"][workspace["id"]]["retries"] == 1
@@ -0,0 +1,78 @@
+"""Role assignment reconciliation against the mock workspace."""
+
+import pytest
+
+ADMIN = "aaaaaaaa-0000-0000-0000-000000000001"
+VIEWER = "aaaaaaaa-0000-0000-0000-000000000002"
+STALE = "aaaaaaaa-0000-0000-0000-000000000003"
+
+
+@pytest.fixture
+def workspace(server):
+    workspace = server.state.add_workspace("Prod")
+    server.state.role_assignments[workspace["id"]] = {
+        principal: {"id": principal, "principal": {"id": principal, "type": "User"}, "role": role}
+        for principal, role in ((ADMIN, "Admin"), (VIEWER, "Viewer"), (STALE, "Member"))
+    }
+    return workspace
+
+
+def _roles(server, workspace_id):
+    return {principal: assignment["role"] for principal, assignment in server.state.role_assignments[workspace_id].items()}
+
+
+def test_reconcile_adds_updates_and_keeps(server, manager, workspace):
+    server.state.principals["users"]["new.user@contoso.com"] = "aaaaaaaa-0000-0000-0000-000000000004"
+    manager.principal_resolver.graph_api_base = f"{server.base_url}/v1.0"
+
+    report = manager.reconcile_role_assignments(workspace["id"], [
+        {"principal": ADMIN, "type": "User", "role": "Admin"},
+        {"principal": VIEWER, "type": "User", "role": "Contributor"},
+        {"principal": "new.user@contoso.com", "type": "User", "role": "Viewer"},
+    ])
+
+    assert [change["principal"] for change in report["unchanged"]] == [ADMIN]
+    assert [change["previous_role"] for change in report["updated"]] == ["Viewer"]
+    assert [change["principal"] for change in report["added"]] == ["aaaaaaaa-0000-0000-0000-000000000004"]
+    assert not report["failed"] and not report["removed"]
+    assert _roles(server, workspace["id"]) == {ADMIN: "Admin", VIEWER: "Contributor", STALE: "Member",
+                                               "aaaaaaaa-0000-0000-0000-000000000004": "Viewer"}
+
+
+def test_remove_unlisted_and_highest_role_wins(server, manager, workspace):
+    report = manager.reconcile_role_assignments(workspace["id"], [
+        {"principal": ADMIN, "type": "User", "role": "Admin"},
+        {"principal": VIEWER, "type": "User", "role": "Viewer"},
+        {"principal": VIEWER, "type": "User", "role": "Member"},
+    ], remove_unlisted=True)
+
+    assert [change["principal"] for change in report["removed"]] == [STALE]
+    assert _roles(server, workspace["id"]) == {ADMIN: "Admin", VIEWER: "Member"}
+
+
+def test_unresolved_principal_disables_removal(server, manager, workspace):
+    manager.principal_resolver.graph_api_base = f"{server.base_url}/v1.0"
+
+    report = manager.reconcile_role_assignments(workspace["id"], [
+        {"principal": ADMIN, "type": "User", "role": "Admin"},
+        {"principal": "missing@contoso.com", "type": "User", "role": "Viewer"},
+    ], remove_unlisted=True)
+
+    assert [change["action"] for change in report["failed"]] == ["resolve"]
+    assert not report["removed"]
+    assert len(server.state.role_assignments[workspace["id"]]) == 3
+
+
+def test_dry_run_changes_nothing(server, manager, workspace):
+    report = manager.reconcile_role_assignments(workspace["id"], [
+        {"principal": VIEWER, "type": "User", "role": "Admin"},
+    ], remove_unlisted=True, dry_run=True)
+
+    assert len(report["updated"]) == 1 and len(report["removed"]) == 2
+    assert _roles(server, workspace["id"]) == {ADMIN: "Admin", VIEWER: "Viewer", STALE: "Member"}
+    assert all(entry.startswith("GET") for entry in server.state.request_log if "/roleAssignments" in entry)
+
+
+def test_invalid_role_is_rejected(manager, workspace):
+    assert manager.reconcile_role_assignments(workspace["id"], [
+        {"principal": ADMIN, "type": "User", "role": "Owner"}]) is None
@@ -0,0 +1,118 @@
+"""DeploymentScheduler dependency graph, levels and run order."""
+
+import json
+import threading
+
+from FabricDeploymentManager import DeploymentScheduler
+
+LAKEHOUSE_ID = "11111111-2222-3333-4444-555555555555"
+
+
+def _item(make_item, full_name, files, display_name=None):
+    name, item_type = full_name.rsplit(".", 1)
+    return {"displayName": display_name or name, "fullName": full_name, "type": item_type,
+            "path": make_item(full_name, files)}
+
+
+def _chain(make_item):
+    """Lakehouse ← SemanticModel ← Report, plus an unrelated Notebook."""
+    return [
+        _item(make_item, "Sales.Report", {"definition.pbir": json.dumps(
+            {"datasetReference": {"byPath": {"path": "../Sales.SemanticModel"}}})}),
+        _item(make_item, "Sales.SemanticModel", {"definition/expressions.tmdl":
+                                                 'expression Source = Sql.Database("server", "Lake")'}),
+        _item(make_item, "Lake.Lakehouse", {".platform": json.dumps({"config": {"logicalId": LAKEHOUSE_ID}})}),
+        _item(make_item, "Clean.Notebook", {"notebook-content.py": "print('clean')"}),
+    ]
+
+
+def _full_names(level):
+    return sorted(item["fullName"] for item in level)
+
+
+def test_graph_and_levels(make_item):
+    items = _chain(make_item)
+    scheduler = DeploymentScheduler(items)
+
+    assert scheduler.dependencies["Sales.Report"] == {"Sales.SemanticModel"}
+    assert scheduler.dependencies["Sales.SemanticModel"] == {"Lake.Lakehouse"}
+    assert scheduler.has_dependents("Lake.Lakehouse") and not scheduler.has_dependents("Sales.Report")
+    assert [_full_names(level) for level in scheduler.levels()] == [
+        ["Clean.Notebook", "Lake.Lakehouse"], ["Sales.SemanticModel"], ["Sales.Report"]]
+
+
+def test_logical_id_reference(make_item):
+    items = _chain(make_item)[2:3] + [
+        _item(make_item, "Load.Dataflow", {"queryMetadata.json": json.dumps({"lakehouseId": LAKEHOUSE_ID})})]
+
+    assert DeploymentScheduler(items).dependencies["Load.Dataflow"] == {"Lake.Lakehouse"}
+
+
+def test_levels_ignore_parents_outside_the_subset(make_item):
+    items = _chain(make_item)
+    scheduler = DeploymentScheduler(items)
+
+    assert [_full_names(level) for level in scheduler.levels(items[:2])] == [
+        ["Sales.SemanticModel"], ["Sales.Report"]]
+
+
+def test_run_deploys_parents_first(make_item):
+    items = _chain(make_item)
+    order = []
+    lock = threading.Lock()
+
+    def deploy(item):
+        with lock:
+            order.append(item["fullName"])
+        return {"fullName": item["fullName"], "status": "deployed"}
+
+    results = DeploymentScheduler(items).run(deploy, max_workers=4)
+
+    assert [entry["fullName"] for entry in results] == [item["fullName"] for item in items]
+    assert order.index("Lake.Lakehouse") < order.index("Sales.SemanticModel") < order.index("Sales.Report")
+
+
+def test_run_skips_dependents_of_failed_parents(make_item):
+    items = _chain(make_item)
+    deployed = []
+
+    def deploy(item):
+        deployed.append(item["fullName"])
+        status = "failed" if item["type"] == "Lakehouse" else "deployed"
+        return {"fullName": item["fullName"], "status": status}
+
+    results = {entry["fullName"]: entry for entry in DeploymentScheduler(items).run(deploy)}
+
+    assert sorted(deployed) == ["Clean.Notebook", "Lake.Lakehouse"]
+    assert results["Sales.SemanticModel"]["error"] == "Dependency failed: Lake.Lakehouse"
+    assert results["Sales.Report"]["error"] == "Dependency failed: Sales.SemanticModel"
+    assert results["Clean.Notebook"]["status"] == "deployed"
+
+
+def test_cycles_are_broken_not_deadlocked(make_item):
+    items = [
+        _item(make_item, "A.Dataflow", {"mashup.pq": 'Source = "../B.Dataflow"'}),
+        _item(make_item, "B.Dataflow", {"mashup.pq": 'Source = "../A.Dataflow"'}),
+        _item(make_item, "C.Notebook", {"notebook-content.py": "print('c')"}),
+    ]
+    scheduler = DeploymentScheduler(items)
+
+    assert [_full_names(level) for level in scheduler.levels()] == [["C.Notebook"], ["A.Dataflow", "B.Dataflow"]]
+    results = scheduler.run(lambda item: {"fullName": item["fullName"], "status": "deployed"}, max_workers=2)
+    assert [entry["status"] for entry in results] == ["deployed"] * 3
+
+
+def test_deploy_skips_dependents_of_a_failed_create(server, manager, make_item, monkeypatch):
+    workspace = server.state.add_workspace("Prod")
+    # Writes the item folders; the unrelated Notebook is left out of the repository
+    _chain(make_item)
+    monkeypatch.setattr(manager, "get_items_from_github",
+                        lambda **kwargs: [item for item in manager.get_items_from_path(make_item.dev_path)
+                                          if item["type"] != "Notebook"])
+    # The Lakehouse is created first; its create is rejected
+    server.inject_fault("POST", rf"/v1/workspaces/{workspace['id']}/items", 403)
+
+    summary = manager.deploy_items_from_github(target_workspace_id=workspace["id"], state_file=None, max_workers=4)
+
+    assert summary["failed"] == 3 and summary["success"] == 0
+    assert server.state.items[workspace["id"]] == []
@@ -0,0 +1,63 @@
+"""Create-or-update routing of deploy_item_from_path against paged item listings."""
+
+
+def _listings(server, workspace_id):
+    return [entry for entry in server.state.request_log if entry.startswith(f"GET /v1/workspaces/{workspace_id}/items")]
+
+
+def test_get_workspace_items_follows_continuation(server, manager):
+    server.page_size = 2
+    workspace = server.state.add_workspace("Prod")
+    for i in range(5):
+        server.state.add_item(workspace["id"], f"Notebook {i}", "Notebook")
+
+    items = manager.get_workspace_items(workspace["id"])
+
+    assert sorted(item["displayName"] for item in items) == [f"Notebook {i}" for i in range(5)]
+    assert len(_listings(server, workspace["id"])) == 3
+
+
+def test_find_item_on_a_later_page(server, manager):
+    server.page_size = 2
+    workspace = server.state.add_workspace("Prod")
+    for i in range(5):
+        server.state.add_item(workspace["id"], f"Notebook {i}", "Notebook")
+
+    assert manager._find_item(workspace["id"], "Notebook 4", "Notebook")["displayName"] == "Notebook 4"
+    assert manager._find_item(workspace["id"], "Notebook 4", "Report") is None
+
+
+def test_existing_item_on_a_later_page_is_updated_not_duplicated(server, manager, make_item):
+    server.page_size = 2
+    workspace = server.state.add_workspace("Prod")
+    for i in range(4):
+        server.state.add_item(workspace["id"], f"Filler {i}", "Notebook")
+    existing = server.state.add_item(workspace["id"], "Sales", "Notebook")
+    item_path = make_item("Sales.Notebook", {"notebook-content.py": "print('v2')"})
+
+    assert manager.deploy_item_from_path(item_path, "Notebook", "Sales", workspace["id"])
+
+    sales = [item for item in server.state.items[workspace["id"]] if item["displayName"] == "Sales"]
+    assert len(sales) == 1
+    assert existing["definitionUpdates"] == 1
+    assert not any(entry == f"POST /v1/workspaces/{workspace['id']}/items" for entry in server.state.request_log)
+
+
+def test_shared_index_lists_workspace_once(server, manager, make_item):
+    workspace = server.state.add_workspace("Prod")
+    existing = server.state.add_item(workspace["id"], "Sales", "Notebook")
+    paths = {name: make_item(f"{name}.Notebook", {"notebook-content.py": f"print('{name}')"})
+             for name in ("Sales", "Finance")}
+
+    index = manager.index_workspace_items(workspace["id"])
+    for name, path in paths.items():
+        assert manager.deploy_item_from_path(path, "Notebook", name, workspace["id"], workspace_index=index)
+    # A second pass updates the item created by the first instead of creating it again
+    assert manager.deploy_item_from_path(paths["Finance"], "Notebook", "Finance", workspace["id"], workspace_index=index)
+
+    names = sorted(item["displayName"] for item in server.state.items[workspace["id"]])
+    assert names == ["Finance", "Sales"]
+    assert existing["definitionUpdates"] == 1
+    finance = next(item for item in server.state.items[workspace["id"]] if item["displayName"] == "Finance")
+    assert finance.get("definitionUpdates") == 1
+    assert len(_listings(server, workspace["id"])) == 1